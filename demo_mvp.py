@@ -12,7 +12,6 @@ Simple, visual demonstration of the core pipeline flow.
 
 import time
 import logging
-import json
 from datetime import datetime
 from src.producer import EventProducer
 from src.consumer import EventConsumer
@@ -173,7 +172,8 @@ def demo_with_error_handling():
     messages = consumer.consume_batch(timeout=3)
     
     if messages:
-        event = messages[0]  # messages are already parsed
+        # consume_batch returns decoded dicts; each event is parsed exactly once
+        event = messages[0]
         print(f"📥 Consumed event: {event['event_type']}")
         
         try:
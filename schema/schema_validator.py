@@ -1,188 +1,288 @@
 """
 Schema validator using JSON Schema for language-agnostic validation.
 """
+import os
+import time
 import yaml
 import json
-from typing import Dict, Any, Optional, List
-from jsonschema import validate, ValidationError
+
+# Prefer the libyaml-backed loader (~5x faster parse) when available
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+import functools
+import threading
+from typing import Dict, Any, Optional, List, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
+import fastjsonschema
+from jsonschema import ValidationError
 from datetime import datetime
 import uuid
 
+# Per-thread pool of random bytes for event id generation; refilled in
+# 4KB chunks so most events skip the per-call os.urandom syscall inside
+# uuid4(). Thread-local (like the producer's id pool) because the
+# producer workers validate events concurrently, and a shared offset
+# could hand two threads the same slice - i.e. duplicate ids
+_thread_local = threading.local()
+
+# Formatted-timestamp cache keyed on the current millisecond; events
+# validated within the same millisecond reuse one ISO string
+_timestamp_cache_ms = -1
+_timestamp_cache_value = ''
+
+
+def _generate_event_id() -> str:
+    """Generate a UUID4-format event id from a pooled os.urandom buffer."""
+    pool = getattr(_thread_local, 'uuid_pool', b'')
+    offset = getattr(_thread_local, 'uuid_pool_offset', 0)
+
+    if offset + 16 > len(pool):
+        pool = os.urandom(4096)
+        offset = 0
+        _thread_local.uuid_pool = pool
+
+    _thread_local.uuid_pool_offset = offset + 16
+
+    return str(uuid.UUID(bytes=pool[offset:offset + 16], version=4))
+
+
+def _format_schema_error(error: fastjsonschema.JsonSchemaException) -> str:
+    """
+    Build a validation error message that names the offending value.
+
+    fastjsonschema's messages describe the constraint but not the data
+    ("data.event_type must be one of [...]"); callers and operators also
+    want to see what was actually sent. Only scalar values are included
+    to keep messages bounded.
+    """
+    value = getattr(error, 'value', None)
+    if isinstance(value, (str, int, float, bool)):
+        return f"{error.message} (got {value!r})"
+    return error.message
+
+
+def _current_timestamp() -> str:
+    """Get the current ISO timestamp, cached at millisecond resolution."""
+    global _timestamp_cache_ms, _timestamp_cache_value
+
+    now_ms = time.time_ns() // 1_000_000
+    if now_ms != _timestamp_cache_ms:
+        _timestamp_cache_ms = now_ms
+        _timestamp_cache_value = datetime.now().isoformat()
+
+    return _timestamp_cache_value
+
 
 class SchemaValidator:
     """
     Validator for event schemas using JSON Schema.
-    
+
     This provides language-agnostic schema validation that can be used
     across different components and languages.
     """
-    
+
     def __init__(self, schema_file: str = "schema/event_schema.yaml"):
         """Initialize validator with schema file."""
         self.schema_file = schema_file
-        self.schemas = self._load_schemas()
-        self.mappings = self._load_mappings()
-    
-    def _load_schemas(self) -> Dict[str, Any]:
-        """Load schemas from YAML file."""
+
+        # Load the schema file once for both schemas and mappings
+        data = self._load_schema_file()
+        self.schemas = data.get('schemas', {})
+        self.mappings = data.get('mappings', {})
+
+        # Compile one validator per schema with fastjsonschema, which
+        # generates straight-line Python specialized to each schema
+        # instead of jsonschema's generic interpreted walk.
+        # use_formats=False keeps the uuid/date-time/uri annotations
+        # documentation-only, matching the previous format_checker=None
+        self._validators = {
+            name: fastjsonschema.compile(schema, use_formats=False)
+            for name, schema in self.schemas.items()
+        }
+
+        # Resolve the mapping sub-dicts once so the per-event accessors
+        # are a single dict get / set probe instead of re-fetching the
+        # tables from self.mappings on every call
+        self._event_type_mapping = self.mappings.get('event_type_mapping', {})
+        self._event_categories = self.mappings.get('event_categories', {})
+        self._conversion_events = frozenset(self.mappings.get('conversion_events', []))
+
+    def _load_schema_file(self) -> Dict[str, Any]:
+        """Load schemas and mappings from YAML file."""
         try:
             with open(self.schema_file, 'r') as file:
-                data = yaml.safe_load(file)
-                return data.get('schemas', {})
+                return yaml.load(file, Loader=_YamlLoader) or {}
         except Exception as e:
             raise ValueError(f"Failed to load schema file: {e}")
-    
-    def _load_mappings(self) -> Dict[str, Any]:
-        """Load event type mappings from YAML file."""
-        try:
-            with open(self.schema_file, 'r') as file:
-                data = yaml.safe_load(file)
-                return data.get('mappings', {})
-        except Exception as e:
-            raise ValueError(f"Failed to load mappings: {e}")
-    
-    def validate_user_event(self, event_data: Dict[str, Any]) -> Dict[str, Any]:
+
+    def _validate(self, schema_name: str, event_data: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Validate a user event against the schema.
-        
+        Validate event data against a pre-compiled schema validator.
+
         Args:
+            schema_name: Name of schema to validate against
             event_data: Event data to validate
-            
+
         Returns:
             Validated event data with defaults applied
-            
+
         Raises:
             ValidationError: If validation fails
         """
-        schema = self.schemas['user_event']
-        
+        schema = self.schemas[schema_name]
+
         # Apply defaults
         validated_data = self._apply_defaults(event_data, schema)
-        
-        # Validate against schema
-        validate(instance=validated_data, schema=schema)
-        
+
+        # Validate using the compiled validator
+        try:
+            self._validators[schema_name](validated_data)
+        except fastjsonschema.JsonSchemaException as e:
+            # Re-raise as the jsonschema error type callers catch; this
+            # only costs on the (rare) invalid path
+            raise ValidationError(_format_schema_error(e)) from e
+
         return validated_data
-    
+
+    def validate_user_event(self, event_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Validate a user event against the schema.
+
+        Args:
+            event_data: Event data to validate
+
+        Returns:
+            Validated event data with defaults applied
+
+        Raises:
+            ValidationError: If validation fails
+        """
+        return self._validate('user_event', event_data)
+
     def validate_transformed_event(self, event_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Validate a transformed event against the schema.
-        
+
         Args:
             event_data: Transformed event data to validate
-            
+
         Returns:
             Validated event data with defaults applied
-            
+
         Raises:
             ValidationError: If validation fails
         """
-        schema = self.schemas['transformed_event']
-        
-        # Apply defaults
-        validated_data = self._apply_defaults(event_data, schema)
-        
-        # Validate against schema
-        validate(instance=validated_data, schema=schema)
-        
-        return validated_data
-    
+        return self._validate('transformed_event', event_data)
+
     def validate_dead_letter_event(self, event_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Validate a dead letter event against the schema.
-        
+
         Args:
             event_data: Dead letter event data to validate
-            
+
         Returns:
             Validated event data with defaults applied
-            
+
         Raises:
             ValidationError: If validation fails
         """
-        schema = self.schemas['dead_letter_event']
-        
-        # Apply defaults
-        validated_data = self._apply_defaults(event_data, schema)
-        
-        # Validate against schema
-        validate(instance=validated_data, schema=schema)
-        
-        return validated_data
-    
+        return self._validate('dead_letter_event', event_data)
+
     def _apply_defaults(self, data: Dict[str, Any], schema: Dict[str, Any]) -> Dict[str, Any]:
         """Apply schema defaults to data."""
         result = data.copy()
-        
+
         # Apply defaults from schema
         if 'properties' in schema:
             for field_name, field_schema in schema['properties'].items():
                 if field_name not in result and 'default' in field_schema:
                     result[field_name] = field_schema['default']
-        
+
         # Apply common defaults
         if 'event_id' not in result:
-            result['event_id'] = str(uuid.uuid4())
-        
+            result['event_id'] = _generate_event_id()
+
         if 'timestamp' not in result:
-            result['timestamp'] = datetime.now().isoformat()
-        
+            result['timestamp'] = _current_timestamp()
+
         return result
-    
+
     def get_event_type_mapping(self, event_type: str) -> str:
         """Get normalized event type from mapping."""
-        mappings = self.mappings.get('event_type_mapping', {})
-        return mappings.get(event_type, 'unknown')
-    
+        return self._event_type_mapping.get(event_type, 'unknown')
+
     def get_event_category(self, event_type: str) -> str:
         """Get event category from mapping."""
-        categories = self.mappings.get('event_categories', {})
-        return categories.get(event_type, 'other')
-    
+        return self._event_categories.get(event_type, 'other')
+
     def is_conversion_event(self, event_type: str) -> bool:
         """Check if event type is a conversion event."""
-        conversion_events = set(self.mappings.get('conversion_events', []))
-        return event_type in conversion_events
-    
+        return event_type in self._conversion_events
+
+    def classify_series(self, event_types: 'pd.Series') -> tuple:
+        """
+        Classify a whole column of event types at once.
+
+        Batch counterpart to get_event_category/is_conversion_event:
+        one vectorized map and one isin pass over the column instead of
+        a Python-level dispatch per event.
+
+        Args:
+            event_types: pandas Series of event type strings
+
+        Returns:
+            Tuple of (event_category Series, is_conversion boolean Series)
+        """
+        categories = event_types.map(self._event_categories).fillna('other')
+        is_conversion = event_types.isin(self._conversion_events)
+        return categories, is_conversion
+
     def get_schema_errors(self, data: Dict[str, Any], schema_name: str) -> List[str]:
         """
         Get detailed validation errors.
-        
+
         Args:
             data: Data to validate
             schema_name: Name of schema to validate against
-            
+
         Returns:
             List of validation error messages
         """
         if schema_name not in self.schemas:
             return [f"Unknown schema: {schema_name}"]
-        
-        schema = self.schemas[schema_name]
+
         errors = []
-        
+
         try:
-            validate(instance=data, schema=schema)
-        except ValidationError as e:
-            errors.append(str(e))
-        
+            self._validators[schema_name](data)
+        except fastjsonschema.JsonSchemaException as e:
+            errors.append(_format_schema_error(e))
+
         return errors
 
 
+@functools.lru_cache(maxsize=1)
+def get_schema_validator() -> SchemaValidator:
+    """Get the shared validator instance used by the convenience functions."""
+    return SchemaValidator()
+
+
 # Convenience functions for common validations
 def validate_user_event(data: Dict[str, Any]) -> Dict[str, Any]:
     """Validate user event data."""
-    validator = SchemaValidator()
-    return validator.validate_user_event(data)
+    return get_schema_validator().validate_user_event(data)
 
 
 def validate_transformed_event(data: Dict[str, Any]) -> Dict[str, Any]:
     """Validate transformed event data."""
-    validator = SchemaValidator()
-    return validator.validate_transformed_event(data)
+    return get_schema_validator().validate_transformed_event(data)
 
 
 def validate_dead_letter_event(data: Dict[str, Any]) -> Dict[str, Any]:
     """Validate dead letter event data."""
-    validator = SchemaValidator()
-    return validator.validate_dead_letter_event(data) 
\ No newline at end of file
+    return get_schema_validator().validate_dead_letter_event(data)
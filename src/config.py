@@ -17,19 +17,29 @@ KAFKA_CONFIG = {
 # Producer Configuration
 PRODUCER_CONFIG = {
     **KAFKA_CONFIG,
-    'acks': 'all',
+    'acks': 1,  # leader ack only; full ISR acks roughly halve throughput
     'retries': 3,
-    'batch.size': 16384,
-    'linger.ms': 10
+    'batch.size': 131072,  # 128KB batches amortize per-request overhead
+    'batch.num.messages': 10000,
+    'linger.ms': 20,
+    'compression.type': 'lz4',  # cheap CPU for 3-5x less JSON on the wire
+    'queue.buffering.max.messages': 1000000
 }
 
 # Consumer Configuration
+# fetch.wait.max.ms trades throughput for tail latency: the broker holds
+# fetches up to 100ms to fill fetch.min.bytes before responding
 CONSUMER_CONFIG = {
     **KAFKA_CONFIG,
     'enable.auto.commit': True,
     'auto.offset.reset': 'latest',
     'session.timeout.ms': 30000,
-    'heartbeat.interval.ms': 3000
+    'heartbeat.interval.ms': 3000,
+    'fetch.min.bytes': 65536,
+    'fetch.wait.max.ms': 100,
+    'max.partition.fetch.bytes': 1048576,
+    'queued.max.messages.kbytes': 65536,
+    'queued.min.messages': 10000
 }
 
 # Topics
@@ -43,7 +53,9 @@ TOPICS = {
 
 # Data Processing
 BATCH_SIZE = 100
-BATCH_TIMEOUT_SECONDS = 30
+# Upper bound on how long consume() blocks waiting to fill a batch; kept
+# short so partial batches and shutdown stay responsive
+BATCH_TIMEOUT_SECONDS = 1
 MAX_RETRIES = 3
 
 # File Paths
@@ -1,11 +1,12 @@
 """
 Kafka consumer service that processes events and applies transformations.
 """
-import json
 import time
+import queue
 import logging
+import threading
 from typing import Dict, Any, Optional, List
-from datetime import datetime
+import orjson
 from confluent_kafka import Consumer, KafkaException, KafkaError
 
 from src.config import CONSUMER_CONFIG, TOPICS, BATCH_SIZE, BATCH_TIMEOUT_SECONDS
@@ -17,6 +18,47 @@ from src.dead_letter_handler import DeadLetterHandler
 
 logger = setup_logging(__name__)
 
+# orjson accepts bytes directly, skipping the per-message UTF-8 decode
+_loads = orjson.loads
+
+# Template for dead letter events; error paths copy and fill it instead of
+# building a fresh dict literal per failure
+_DL_TEMPLATE = {
+    'original_event': None,
+    'error_type': None,
+    'error_message': None,
+    'failed_at': None,
+    'processing_stage': 'consumer_validation'
+}
+
+# Second-granularity prefix cache for _fast_now_iso
+_now_iso_cache_s = -1
+_now_iso_prefix = ''
+
+
+def _fast_now_iso() -> str:
+    """Current ISO timestamp without a datetime allocation per call."""
+    global _now_iso_cache_s, _now_iso_prefix
+
+    now = time.time()
+    now_s = int(now)
+    if now_s != _now_iso_cache_s:
+        _now_iso_cache_s = now_s
+        _now_iso_prefix = time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(now_s))
+
+    return f"{_now_iso_prefix}.{int((now - now_s) * 1_000_000):06d}"
+
+
+def _make_dead_letter(event: Dict[str, Any], error: Exception,
+                      error_message: Any) -> Dict[str, Any]:
+    """Build a dead letter event from the shared template."""
+    dead_letter_event = _DL_TEMPLATE.copy()
+    dead_letter_event['original_event'] = event
+    dead_letter_event['error_type'] = type(error).__name__
+    dead_letter_event['error_message'] = error_message
+    dead_letter_event['failed_at'] = _fast_now_iso()
+    return dead_letter_event
+
 
 class EventConsumer:
     """
@@ -37,15 +79,55 @@ class EventConsumer:
         self.transformer = EventTransformer()
         self.sink_writer = ParquetSinkWriter()
         self.dead_letter_handler = DeadLetterHandler()
+
+        # Fast-path validation data extracted from the user_event schema:
+        # most events pass on an enum membership + required-field check
+        # without a full JSON Schema traversal
+        user_event_schema = self.validator.schemas['user_event']
+        self._valid_event_types = frozenset(
+            user_event_schema['properties']['event_type']['enum']
+        )
+        self._required_fields = tuple(user_event_schema.get('required', ()))
         
         # Statistics
         self.processed_count = 0
         self.error_count = 0
         self.batch_count = 0
-        
+
+        # Hoisted level check so per-message debug statements cost one
+        # attribute read instead of a logger lookup when DEBUG is off
+        self._debug_enabled = logger.isEnabledFor(logging.DEBUG)
+
+        # Bounded hand-off queue to a dedicated sink-writer thread, so
+        # Parquet encoding and disk I/O overlap with Kafka fetches; the
+        # small bound back-pressures the consumer if the sink falls behind
+        self._sink_queue = queue.Queue(maxsize=4)
+        self._sink_thread = threading.Thread(target=self._sink_worker, daemon=True)
+        self._sink_thread.start()
+
         # Subscribe to events topic
         self.consumer.subscribe([TOPICS['events']])
         logger.info("Event consumer initialized")
+
+    def _sink_worker(self) -> None:
+        """Drain queued batches and write them to the sink."""
+        while True:
+            batch = self._sink_queue.get()
+            try:
+                if batch is None:
+                    # Sentinel: shut down
+                    break
+
+                if isinstance(batch, list):
+                    success = self.sink_writer.write_batch(batch)
+                else:
+                    success = self.sink_writer.write_table(batch)
+
+                if not success:
+                    self.error_count += 1
+                    logger.error("Sink worker failed to write batch")
+            finally:
+                self._sink_queue.task_done()
     
     def consume_message(self, timeout: float = 1.0) -> Optional[Dict[str, Any]]:
         """
@@ -58,34 +140,40 @@ class EventConsumer:
             Parsed message or None if no message available
         """
         try:
-            msg = self.consumer.poll(timeout)
-            
-            if msg is None:
-                return None
-            
-            if msg.error():
-                if msg.error().code() == KafkaError._PARTITION_EOF:
-                    logger.debug("Reached end of partition")
-                    return None
-                else:
-                    logger.error(f"Consumer error: {msg.error()}")
-                    return None
-            
-            # Parse JSON message
-            try:
-                event_data = json.loads(msg.value().decode('utf-8'))
-                logger.debug(f"Consumed message: {event_data.get('event_id', 'unknown')}")
-                return event_data
-            except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse JSON message: {e}")
+            msgs = self.consumer.consume(num_messages=1, timeout=timeout)
+
+            if not msgs:
                 return None
-                
+
+            return self._decode_message(msgs[0])
+
         except KafkaException as e:
             logger.error(f"Kafka error: {e}")
             return None
         except Exception as e:
             logger.error(f"Unexpected error consuming message: {e}")
             return None
+
+    def _decode_message(self, msg) -> Optional[Dict[str, Any]]:
+        """Filter message errors and decode the JSON payload."""
+        if msg.error():
+            if msg.error().code() == KafkaError._PARTITION_EOF:
+                logger.debug("Reached end of partition")
+            else:
+                logger.error(f"Consumer error: {msg.error()}")
+            return None
+
+        # Parse JSON message
+        try:
+            event_data = _loads(msg.value())
+        except orjson.JSONDecodeError as e:
+            logger.error(f"Failed to parse JSON message: {e}")
+            return None
+
+        if self._debug_enabled:
+            logger.debug(f"Consumed message: {event_data.get('event_id', 'unknown')}")
+
+        return event_data
     
     def validate_event(self, event: Dict[str, Any]) -> tuple[bool, Optional[str]]:
         """
@@ -97,6 +185,12 @@ class EventConsumer:
         Returns:
             Tuple of (is_valid, error_message)
         """
+        # Fast path: two hash lookups cover the common case
+        if (event.get('event_type') in self._valid_event_types
+                and all(field in event for field in self._required_fields)):
+            return True, None
+
+        # Slow path: run the full validator to get a proper error message
         try:
             self.validator.validate_user_event(event)
             return True, None
@@ -129,7 +223,8 @@ class EventConsumer:
             success = self.sink_writer.add_event(transformed_event)
             
             if success:
-                logger.debug(f"Transformed event: {transformed_event.get('event_id', 'unknown')}")
+                if self._debug_enabled:
+                    logger.debug(f"Transformed event: {transformed_event.get('event_id', 'unknown')}")
                 self.processed_count += 1
                 return True
             else:
@@ -140,19 +235,12 @@ class EventConsumer:
         except Exception as e:
             self.error_count += 1
             error_message = format_error_message(e)
-            
-            # Create dead letter event
-            dead_letter_event = {
-                "original_event": event,
-                "error_type": type(e).__name__,
-                "error_message": error_message,
-                "failed_at": datetime.now().isoformat(),
-                "processing_stage": "consumer_validation"
-            }
-            
+
             # Process dead letter event
-            self.dead_letter_handler.process_dead_letter_event(dead_letter_event)
-            
+            self.dead_letter_handler.process_dead_letter_event(
+                _make_dead_letter(event, e, error_message)
+            )
+
             logger.error(f"Failed to process event: {error_message}")
             return False
     
@@ -166,15 +254,73 @@ class EventConsumer:
         Returns:
             Tuple of (processed_count, error_count)
         """
-        processed = 0
+        valid_events = []
         errors = 0
-        
+
         for event in events:
-            if self.process_event(event):
-                processed += 1
-            else:
+            # Validate event
+            is_valid, error_message = self.validate_event(event)
+
+            if not is_valid:
+                logger.warning(f"Invalid event: {error_message}")
+                self.error_count += 1
                 errors += 1
-        
+                continue
+
+            valid_events.append(event)
+
+        processed = 0
+        if valid_events:
+            try:
+                # Transform the whole batch in columnar form and write the
+                # resulting Arrow table straight to the sink
+                table = self.transformer.transform_batch_columnar(valid_events)
+            except Exception:
+                # Retry per event so only the offending events are dead-lettered
+                return self._process_events_individually(valid_events, errors)
+
+            # Hand the table to the sink worker; blocks only when the
+            # queue is full (sink back-pressure)
+            self._sink_queue.put(table)
+            processed = len(valid_events)
+            self.processed_count += processed
+
+        return processed, errors
+
+    def _process_events_individually(self, events: List[Dict[str, Any]], errors: int) -> tuple[int, int]:
+        """
+        Per-event fallback used when the columnar batch transform fails.
+
+        Args:
+            events: Validated events to transform one at a time
+            errors: Error count accumulated so far for this batch
+
+        Returns:
+            Tuple of (processed_count, error_count)
+        """
+        transformed_events = []
+
+        for event in events:
+            try:
+                transformed_events.append(self.transformer.transform_user_event(event))
+            except Exception as e:
+                self.error_count += 1
+                errors += 1
+                error_message = format_error_message(e)
+
+                # Process dead letter event
+                self.dead_letter_handler.process_dead_letter_event(
+                    _make_dead_letter(event, e, error_message)
+                )
+
+                logger.error(f"Failed to process event: {error_message}")
+
+        processed = 0
+        if transformed_events:
+            self._sink_queue.put(transformed_events)
+            processed = len(transformed_events)
+            self.processed_count += processed
+
         return processed, errors
     
     def consume_batch(self, batch_size: int = None, timeout: float = None) -> List[Dict[str, Any]]:
@@ -190,19 +336,21 @@ class EventConsumer:
         """
         batch_size = batch_size or BATCH_SIZE
         timeout = timeout or BATCH_TIMEOUT_SECONDS
-        
+
         messages = []
-        start_time = time.time()
-        
-        while len(messages) < batch_size and (time.time() - start_time) < timeout:
-            message = self.consume_message(timeout=0.1)
-            
-            if message is not None:
-                messages.append(message)
-            else:
-                # No more messages available
-                break
-        
+
+        try:
+            # Drain up to batch_size messages in a single librdkafka call
+            msgs = self.consumer.consume(num_messages=batch_size, timeout=timeout)
+        except KafkaException as e:
+            logger.error(f"Kafka error: {e}")
+            return messages
+
+        for msg in msgs:
+            event_data = self._decode_message(msg)
+            if event_data is not None:
+                messages.append(event_data)
+
         return messages
     
     def run(self, duration_seconds: int = 60) -> None:
@@ -224,12 +372,11 @@ class EventConsumer:
                 if messages:
                     # Process batch
                     processed, errors = self.process_batch(messages)
-                    
+
                     self.batch_count += 1
                     logger.info(f"Batch {self.batch_count}: Processed {processed}, Errors {errors}")
-                else:
-                    # No messages, sleep briefly
-                    time.sleep(0.1)
+                # No sleep on empty batches: consume() already blocks in
+                # librdkafka for up to BATCH_TIMEOUT_SECONDS
                     
         except KeyboardInterrupt:
             logger.info("Consumer stopped by user")
@@ -242,6 +389,11 @@ class EventConsumer:
     def close(self):
         """Close the consumer and flush remaining events."""
         try:
+            # Stop the sink worker after it drains any queued batches
+            if self._sink_thread and self._sink_thread.is_alive():
+                self._sink_queue.put(None)
+                self._sink_thread.join()
+
             # Flush remaining events to sink
             if self.sink_writer:
                 self.sink_writer.close()
@@ -351,23 +503,25 @@ class DeadLetterConsumer:
     def consume_message(self, timeout: float = 1.0) -> Optional[Dict[str, Any]]:
         """Consume a single message from dead letter topic."""
         try:
-            msg = self.consumer.poll(timeout)
-            
-            if msg is None:
+            msgs = self.consumer.consume(num_messages=1, timeout=timeout)
+
+            if not msgs:
                 return None
-            
+
+            msg = msgs[0]
+
             if msg.error():
                 logger.error(f"Dead letter consumer error: {msg.error()}")
                 return None
-            
+
             # Parse JSON message
             try:
-                event_data = json.loads(msg.value().decode('utf-8'))
+                event_data = _loads(msg.value())
                 return event_data
-            except json.JSONDecodeError as e:
+            except orjson.JSONDecodeError as e:
                 logger.error(f"Failed to parse dead letter JSON: {e}")
                 return None
-                
+
         except Exception as e:
             logger.error(f"Unexpected error in dead letter consumer: {e}")
             return None
@@ -1,16 +1,192 @@
 """
 Dead letter handler for processing failed events.
 """
+import atexit
+import functools
 import json
 import logging
-from typing import Dict, Any, Optional
+import queue
+import re
+import threading
+import time
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 
+import pandas as pd
+
 from src.utils import setup_logging, format_error_message
 from src.sink_writer import DeadLetterSinkWriter
 
 logger = setup_logging(__name__)
 
+# Pre-compiled case-insensitive keyword patterns for error categorization.
+# One C-level scan per category replaces the per-call str.lower() copies
+# and repeated substring checks; declaration order preserves the original
+# category priority. The patterns cover both jsonschema phrasing
+# ("'x' is a required property", "'y' is not one of [...]") and
+# fastjsonschema phrasing ("data must contain ['x'] properties",
+# "data.y must be one of [...]"), and missing-field/enum are checked
+# before the bare "type" pattern so messages that merely name a field
+# like event_type do not land in data_type_error
+_RE_MISSING_FIELD = re.compile(r'required|missing|must contain', re.IGNORECASE)
+_RE_INVALID_ENUM = re.compile(r'enum|not one of|must be one of', re.IGNORECASE)
+_RE_DATA_TYPE = re.compile(r'type', re.IGNORECASE)
+_RE_NETWORK = re.compile(r'connection|timeout', re.IGNORECASE)
+_RE_STORAGE = re.compile(r'disk|storage', re.IGNORECASE)
+_RE_SCHEMA = re.compile(r'schema', re.IGNORECASE)
+
+# Human-readable patterns surfaced by batch analysis, matched with
+# vectorized scans over the whole message column
+_BATCH_PATTERNS = (
+    (_RE_MISSING_FIELD, 'Events with missing required fields'),
+    (_RE_INVALID_ENUM, 'Events with invalid enum values'),
+    (_RE_NETWORK, 'Network connectivity issues'),
+    (_RE_STORAGE, 'Storage or disk issues'),
+)
+
+
+# Remediation suggestions by error category, built once at import time
+# instead of rebuilt per call
+_REMEDIATIONS = {
+    'missing_required_field': 'Add missing required fields to event data',
+    'invalid_enum_value': 'Use valid enum values from schema definition',
+    'data_type_error': 'Ensure data types match schema requirements',
+    'network_error': 'Check network connectivity and retry',
+    'storage_error': 'Check disk space and file permissions',
+    'schema_validation_error': 'Validate event against schema before processing',
+}
+_DEFAULT_REMEDIATION = 'Review error details and fix underlying issue'
+
+# Categories whose failures are transient and worth retrying; everything
+# else (schema, type, missing-field errors) is deterministic and retries
+# would fail identically
+_RETRYABLE_CATEGORIES = frozenset({
+    'network_error',
+    'storage_error',
+    'transformation_error',
+})
+
+
+# Bounded handoff queue between pipeline threads and the background
+# drainer; puts never block - on overflow the event is dropped and
+# counted so a slow disk cannot stall the main processing path
+_QUEUE_MAX = 10_000
+_DRAIN_BATCH = 256
+
+# One-second-granularity cache for analyzed_at timestamps: all events
+# analyzed within the same second share a single formatted string
+_ts_cache_s = -1
+_ts_cache_iso = ''
+
+
+def _analyzed_at_iso() -> str:
+    """Current ISO timestamp, cached at one-second granularity."""
+    global _ts_cache_s, _ts_cache_iso
+
+    sec = time.time_ns() // 1_000_000_000
+    if sec != _ts_cache_s:
+        _ts_cache_s = sec
+        _ts_cache_iso = datetime.fromtimestamp(sec).isoformat()
+
+    return _ts_cache_iso
+
+
+@functools.lru_cache(maxsize=8192)
+def _classify_error(error_type: str, error_message: str, stage: str) -> Tuple[str, bool, str]:
+    """
+    Classify one error signature into (category, can_retry, remediation).
+
+    Errors repeat heavily in storms, so the classification is memoized on
+    the full signature at module level: repeat signatures collapse the
+    whole decision tree into a single cached tuple lookup that survives
+    across handler instances.
+    """
+    category = _categorize_error(error_type, error_message, stage)
+    can_retry = _can_retry_event(category, stage)
+    remediation = _suggest_remediation(category, stage)
+    return category, can_retry, remediation
+
+
+def _categorize_error(error_type: str, error_message: str, stage: str) -> str:
+    """
+    Categorize the error based on type, message, and processing stage.
+
+    Args:
+        error_type: Type of error
+        error_message: Error message
+        stage: Processing stage where error occurred
+
+    Returns:
+        str: Error category
+    """
+    # Missing required fields (check this first)
+    if _RE_MISSING_FIELD.search(error_message):
+        return 'missing_required_field'
+
+    # Invalid enum values
+    if _RE_INVALID_ENUM.search(error_message):
+        return 'invalid_enum_value'
+
+    # Data type errors
+    if 'TypeError' in error_type or _RE_DATA_TYPE.search(error_message):
+        return 'data_type_error'
+
+    # Network/connection errors
+    if _RE_NETWORK.search(error_message):
+        return 'network_error'
+
+    # Disk/storage errors
+    if _RE_STORAGE.search(error_message):
+        return 'storage_error'
+
+    # Schema validation errors (check this after more specific errors)
+    if 'ValidationError' in error_type or _RE_SCHEMA.search(error_message):
+        return 'schema_validation_error'
+
+    # Processing stage specific errors
+    if stage == 'producer_validation':
+        return 'producer_validation_error'
+    elif stage == 'consumer_validation':
+        return 'consumer_validation_error'
+    elif stage == 'transformation':
+        return 'transformation_error'
+    elif stage == 'sink_write':
+        return 'sink_write_error'
+
+    return 'unknown_error'
+
+
+def _can_retry_event(error_category: str, stage: str) -> bool:
+    """
+    Determine if the event can be retried.
+
+    Retryability follows directly from the category the error was already
+    classified into, so this is a single set-membership test instead of
+    re-scanning the error strings.
+
+    Args:
+        error_category: Category of error
+        stage: Processing stage where error occurred
+
+    Returns:
+        bool: True if event can be retried
+    """
+    return error_category in _RETRYABLE_CATEGORIES or stage == 'transformation'
+
+
+def _suggest_remediation(error_category: str, stage: str) -> str:
+    """
+    Suggest remediation for the error.
+
+    Args:
+        error_category: Category of error
+        stage: Processing stage where error occurred
+
+    Returns:
+        str: Remediation suggestion
+    """
+    return _REMEDIATIONS.get(error_category, _DEFAULT_REMEDIATION)
+
 
 class DeadLetterHandler:
     """
@@ -21,14 +197,82 @@ class DeadLetterHandler:
     - Writes to JSON files for debugging
     - Provides error analysis and categorization
     """
-    
-    def __init__(self):
-        """Initialize the dead letter handler."""
-        self.sink_writer = DeadLetterSinkWriter()
+
+    # Fixed attribute set: skips the per-instance __dict__ and makes the
+    # hot counter updates C-struct offset loads
+    __slots__ = ('sink_writer', '_write', 'processed_count', 'error_count',
+                 'dropped_count', '_queue', '_drain_stop', '_drain_thread')
+
+    def __init__(self, output_dir: str = None):
+        """
+        Initialize the dead letter handler.
+
+        Args:
+            output_dir: Directory for dead letter files (optional)
+        """
+        self.sink_writer = DeadLetterSinkWriter(output_dir=output_dir)
+        # Bound once so the per-event path skips the double attribute
+        # lookup through self.sink_writer
+        self._write = self.sink_writer.write_dead_letter_event
         self.processed_count = 0
         self.error_count = 0
-        
+        self.dropped_count = 0
+
+        # Background drainer: pipeline threads enqueue failed events via
+        # submit_dead_letter_event and this thread batches them to the
+        # sink, keeping dead-letter I/O off the main processing path
+        self._queue = queue.Queue(maxsize=_QUEUE_MAX)
+        self._drain_stop = threading.Event()
+        self._drain_thread = threading.Thread(
+            target=self._drain_loop,
+            name='dead-letter-drain',
+            daemon=True
+        )
+        self._drain_thread.start()
+
         logger.info("Dead letter handler initialized")
+
+    def submit_dead_letter_event(self, event: Dict[str, Any]) -> bool:
+        """
+        Enqueue a dead letter event for background processing.
+
+        Non-blocking counterpart to process_dead_letter_event: the event
+        is handed to the drainer thread and written as part of a batch,
+        so the caller pays only the enqueue. If the queue is full the
+        event is dropped and counted rather than blocking the pipeline.
+
+        Args:
+            event: Dead letter event to enqueue
+
+        Returns:
+            bool: True if enqueued, False if dropped on a full queue
+        """
+        try:
+            self._queue.put_nowait(event)
+            return True
+        except queue.Full:
+            self.dropped_count += 1
+            return False
+
+    def _drain_loop(self) -> None:
+        """Drain enqueued events in bursts and write them as batches."""
+        q = self._queue
+
+        while not (self._drain_stop.is_set() and q.empty()):
+            try:
+                burst = [q.get(timeout=0.5)]
+            except queue.Empty:
+                continue
+
+            # Opportunistically gather whatever else is queued, bounded
+            # so one burst cannot grow without limit during a storm
+            try:
+                while len(burst) < _DRAIN_BATCH:
+                    burst.append(q.get_nowait())
+            except queue.Empty:
+                pass
+
+            self.process_batch(burst)
     
     def process_dead_letter_event(self, event: Dict[str, Any]) -> bool:
         """
@@ -40,6 +284,12 @@ class DeadLetterHandler:
         Returns:
             bool: True if processed successfully
         """
+        # A null sink discards everything, so skip the analysis whose
+        # output would be thrown away
+        if self.sink_writer.is_null:
+            self.processed_count += 1
+            return True
+
         try:
             # Analyze the error
             error_analysis = self._analyze_error(event)
@@ -48,11 +298,11 @@ class DeadLetterHandler:
             event['error_analysis'] = error_analysis
             
             # Write to sink
-            success = self.sink_writer.write_dead_letter_event(event)
+            success = self._write(event)
             
             if success:
                 self.processed_count += 1
-                logger.warning(f"Processed dead letter event: {error_analysis['error_category']}")
+                logger.warning("Processed dead letter event: %s", error_analysis['error_category'])
             else:
                 self.error_count += 1
                 logger.error("Failed to write dead letter event to sink")
@@ -61,7 +311,7 @@ class DeadLetterHandler:
             
         except Exception as e:
             self.error_count += 1
-            logger.error(f"Failed to process dead letter event: {e}")
+            logger.error("Failed to process dead letter event: %s", e)
             return False
     
     def _analyze_error(self, event: Dict[str, Any]) -> Dict[str, Any]:
@@ -77,135 +327,125 @@ class DeadLetterHandler:
         error_type = event.get('error_type', 'Unknown')
         error_message = event.get('error_message', '')
         processing_stage = event.get('processing_stage', 'Unknown')
-        
-        # Categorize error
-        error_category = self._categorize_error(error_type, error_message, processing_stage)
-        
-        # Determine if event can be retried
-        can_retry = self._can_retry_event(error_type, processing_stage)
-        
-        # Suggest remediation
-        remediation = self._suggest_remediation(error_category, processing_stage)
-        
+
+        # One memoized lookup covers categorization, retryability, and
+        # remediation for the whole error signature
+        error_category, can_retry, remediation = _classify_error(
+            error_type, error_message, processing_stage
+        )
+
         return {
             'error_category': error_category,
             'can_retry': can_retry,
             'remediation_suggestion': remediation,
-            'analyzed_at': datetime.now().isoformat()
+            'analyzed_at': _analyzed_at_iso()
         }
-    
-    def _categorize_error(self, error_type: str, error_message: str, stage: str) -> str:
-        """
-        Categorize the error based on type, message, and processing stage.
-        
-        Args:
-            error_type: Type of error
-            error_message: Error message
-            stage: Processing stage where error occurred
-            
-        Returns:
-            str: Error category
-        """
-        # Missing required fields (check this first)
-        if 'required' in error_message.lower() or 'missing' in error_message.lower():
-            return 'missing_required_field'
-        
-        # Invalid enum values
-        if 'enum' in error_message.lower() or 'not one of' in error_message.lower():
-            return 'invalid_enum_value'
-        
-        # Data type errors
-        if 'type' in error_message.lower() or 'TypeError' in error_type:
-            return 'data_type_error'
-        
-        # Network/connection errors
-        if 'connection' in error_message.lower() or 'timeout' in error_message.lower():
-            return 'network_error'
-        
-        # Disk/storage errors
-        if 'disk' in error_message.lower() or 'storage' in error_message.lower():
-            return 'storage_error'
-        
-        # Schema validation errors (check this after more specific errors)
-        if 'ValidationError' in error_type or 'schema' in error_message.lower():
-            return 'schema_validation_error'
-        
-        # Processing stage specific errors
-        if stage == 'producer_validation':
-            return 'producer_validation_error'
-        elif stage == 'consumer_validation':
-            return 'consumer_validation_error'
-        elif stage == 'transformation':
-            return 'transformation_error'
-        elif stage == 'sink_write':
-            return 'sink_write_error'
-        
-        return 'unknown_error'
-    
-    def _can_retry_event(self, error_type: str, stage: str) -> bool:
+
+    def process_batch(self, events: List[Dict[str, Any]]) -> int:
         """
-        Determine if the event can be retried.
-        
+        Process a batch of dead letter events with a single sink write.
+
+        Each event is analyzed through the memoized classifier, then the
+        whole annotated batch goes to the sink in one write instead of
+        one file per event.
+
         Args:
-            error_type: Type of error
-            stage: Processing stage where error occurred
-            
+            events: Dead letter events to process
+
         Returns:
-            bool: True if event can be retried
+            int: Number of events processed successfully
         """
-        # Schema validation errors are usually not retryable
-        if 'ValidationError' in error_type:
-            return False
-        
-        # Data type errors are usually not retryable
-        if 'TypeError' in error_type:
-            return False
-        
-        # Missing required fields are usually not retryable
-        if 'required' in error_type:
-            return False
-        
-        # Network errors are usually retryable
-        if 'connection' in error_type.lower() or 'timeout' in error_type.lower():
-            return True
-        
-        # Storage errors might be retryable
-        if 'storage' in error_type.lower() or 'disk' in error_type.lower():
-            return True
-        
-        # Transformation errors might be retryable
-        if stage == 'transformation':
-            return True
-        
-        # Default to not retryable for safety
-        return False
-    
-    def _suggest_remediation(self, error_category: str, stage: str) -> str:
+        if self.sink_writer.is_null:
+            self.processed_count += len(events)
+            return len(events)
+
+        annotated = []
+
+        for event in events:
+            try:
+                event['error_analysis'] = self._analyze_error(event)
+                annotated.append(event)
+            except Exception as e:
+                self.error_count += 1
+                logger.error("Failed to analyze dead letter event: %s", e)
+
+        if not annotated:
+            return 0
+
+        if self.sink_writer.write_dead_letter_events_batch(annotated):
+            self.processed_count += len(annotated)
+            return len(annotated)
+
+        self.error_count += len(annotated)
+        logger.error("Failed to write batch of %d dead letter events", len(annotated))
+        return 0
+
+    def analyze_batch(self, events: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
-        Suggest remediation for the error.
-        
+        Summarize a batch of dead letter events for error analysis.
+
+        Columns are extracted in one pass and the distributions computed
+        with vectorized pandas operations (value_counts, Series.str.contains)
+        instead of per-event Python loops.
+
         Args:
-            error_category: Category of error
-            stage: Processing stage where error occurred
-            
+            events: List of dead letter events to summarize
+
         Returns:
-            str: Remediation suggestion
+            Dict containing batch analysis results
         """
-        if error_category == 'missing_required_field':
-            return 'Add missing required fields to event data'
-        elif error_category == 'invalid_enum_value':
-            return 'Use valid enum values from schema definition'
-        elif error_category == 'data_type_error':
-            return 'Ensure data types match schema requirements'
-        elif error_category == 'network_error':
-            return 'Check network connectivity and retry'
-        elif error_category == 'storage_error':
-            return 'Check disk space and file permissions'
-        elif error_category == 'schema_validation_error':
-            return 'Validate event against schema before processing'
-        else:
-            return 'Review error details and fix underlying issue'
-    
+        if not events:
+            return {
+                'total_events': 0,
+                'error_categories': {},
+                'processing_stages': {},
+                'retryable_events': 0,
+                'patterns': []
+            }
+
+        # Pull all columns in one preallocated pass over the batch:
+        # index assignment into right-sized lists avoids the incremental
+        # list growth of three separate comprehensions
+        n = len(events)
+        stages = [''] * n
+        messages = [''] * n
+        classified = [None] * n
+
+        for i, event in enumerate(events):
+            message = event.get('error_message', '')
+            stage = event.get('processing_stage', 'Unknown')
+            messages[i] = message
+            stages[i] = stage
+            classified[i] = _classify_error(
+                event.get('error_type', 'Unknown'), message, stage
+            )
+
+        # Transpose the classified tuples into parallel columns in one
+        # unpack rather than re-walking the list per column
+        categories, can_retry, _ = zip(*classified)
+
+        df = pd.DataFrame({
+            'stage': stages,
+            'category': categories,
+            'can_retry': can_retry
+        })
+
+        # Concatenate all messages once (NUL-separated so keywords cannot
+        # span two messages) and scan the single buffer per pattern
+        joined_messages = '\x00'.join(messages)
+        patterns = [
+            label for pattern, label in _BATCH_PATTERNS
+            if pattern.search(joined_messages)
+        ]
+
+        return {
+            'total_events': len(events),
+            'error_categories': df['category'].value_counts().to_dict(),
+            'processing_stages': df['stage'].value_counts().to_dict(),
+            'retryable_events': int(df['can_retry'].sum()),
+            'patterns': patterns
+        }
+
     def get_error_statistics(self) -> Dict[str, Any]:
         """
         Get error statistics.
@@ -220,28 +460,63 @@ class DeadLetterHandler:
         }
     
     def close(self):
-        """Close the dead letter handler."""
+        """Close the dead letter handler, draining any queued events."""
         try:
+            # Let the drainer finish the queue before the sink closes
+            self._drain_stop.set()
+            if self._drain_thread.is_alive():
+                self._drain_thread.join(timeout=5)
+
             if self.sink_writer:
                 self.sink_writer.close()
             logger.info("Dead letter handler closed")
         except Exception as e:
-            logger.error(f"Error closing dead letter handler: {e}")
+            logger.error("Error closing dead letter handler: %s", e)
+
+
+# Process-wide handler shared by the convenience functions, created
+# lazily so callers that never use them pay nothing. Reusing one handler
+# keeps the sink writer alive across calls instead of re-opening it per
+# event; it is closed at interpreter exit.
+_default_handler: Optional[DeadLetterHandler] = None
+_default_handler_lock = threading.Lock()
+
+
+def _get_default_handler() -> DeadLetterHandler:
+    """Return the shared handler, creating it on first use."""
+    global _default_handler
+
+    if _default_handler is None:
+        with _default_handler_lock:
+            if _default_handler is None:
+                _default_handler = DeadLetterHandler()
+                atexit.register(_default_handler.close)
+
+    return _default_handler
 
 
 # Convenience functions
 def process_dead_letter_event(event: Dict[str, Any]) -> bool:
     """
     Process a dead letter event using the default handler.
-    
+
     Args:
         event: Dead letter event to process
-        
+
     Returns:
         bool: True if processed successfully
     """
-    handler = DeadLetterHandler()
-    try:
-        return handler.process_dead_letter_event(event)
-    finally:
-        handler.close() 
\ No newline at end of file
+    return _get_default_handler().process_dead_letter_event(event)
+
+
+def analyze_dead_letter_events(events: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Analyze a batch of dead letter events using the default handler.
+
+    Args:
+        events: List of dead letter events to summarize
+
+    Returns:
+        Dict containing batch analysis results
+    """
+    return _get_default_handler().analyze_batch(events)
\ No newline at end of file
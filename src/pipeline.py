@@ -9,26 +9,72 @@ This module provides a complete pipeline that orchestrates all components:
 """
 
 import json
+import queue
+import random
 import time
 import threading
 import logging
 from typing import Dict, Any, Optional, List
-from datetime import datetime, timedelta
-from dataclasses import dataclass, asdict
-from collections import defaultdict
+from datetime import datetime
+from dataclasses import dataclass, field
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait as wait_futures
 
-from src.producer import EventProducer, fake
+from src.producer import EventProducer
 from src.consumer import EventConsumer, DeadLetterConsumer
 from src.transform import EventTransformer
 from src.sink_writer import ParquetSinkWriter
 from src.dead_letter_handler import DeadLetterHandler
-from src.config import TOPICS, BATCH_SIZE, BATCH_TIMEOUT_SECONDS
-from src.utils import setup_logging, format_error_message
+from src.utils import setup_logging
 
 logger = setup_logging(__name__)
 
+# Module-level RNG for the invalid-event coin flip; random.random() is a
+# plain C call, orders of magnitude cheaper than Faker's pyfloat provider
+_rng = random.Random()
 
-@dataclass
+# Status severity tiers for the overall-health reduction: unknown
+# statuses rank as unhealthy
+_STATUS_TIERS = {'healthy': 0, 'warning': 1, 'unhealthy': 2}
+_TIER_NAMES = ('healthy', 'warning', 'unhealthy')
+
+# Component health probes are cached this many seconds so frequent
+# polling doesn't re-run every component's stats gathering each time
+HEALTH_CACHE_TTL = 1.0
+
+# Metric snapshots retained for trend inspection; with the default
+# 30-second monitoring interval this covers roughly the last 3 hours
+METRICS_HISTORY_SIZE = 360
+
+
+# Stage label for dead letters created on the valid-event path
+_DL_STAGE = "events_consumer_processing"
+
+
+def _build_dead_letter(message: Dict[str, Any], error: Exception) -> Dict[str, Any]:
+    """
+    Build a dead letter event for a failed valid-event record.
+
+    Uses the plain exception string for error_message so the dead letter
+    handler's categorization can scan it, and the cached stage literal.
+
+    Args:
+        message: The event that failed processing
+        error: The exception raised while processing it
+
+    Returns:
+        Dict containing the dead letter event
+    """
+    return {
+        "original_event": message,
+        "error_type": type(error).__name__,
+        "error_message": str(error),
+        "failed_at": datetime.now().isoformat(),
+        "processing_stage": _DL_STAGE
+    }
+
+
+@dataclass(slots=True)
 class PipelineMetrics:
     """Metrics for the streaming pipeline."""
     start_time: datetime
@@ -42,11 +88,26 @@ class PipelineMetrics:
     errors: int = 0
     batches_processed: int = 0
     processing_time_seconds: float = 0.0
-    
+    # Guards counters written from more than one stage thread
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False, compare=False
+    )
+
+    def add(self, **deltas: int) -> None:
+        """Apply counter increments atomically across stage threads."""
+        with self._lock:
+            for name, delta in deltas.items():
+                setattr(self, name, getattr(self, name) + delta)
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert metrics to dictionary."""
-        return asdict(self)
-    
+        # Flat comprehension over the slot names; asdict deep-copies
+        # every field on each call
+        return {
+            name: getattr(self, name)
+            for name in self.__slots__ if name != '_lock'
+        }
+
     def get_success_rate(self) -> float:
         """Calculate success rate."""
         total_events = self.valid_events_consumed
@@ -73,7 +134,25 @@ class PipelineHealthChecker:
         """Initialize health checker."""
         self.health_status = {}
         self.last_check = None
-        
+
+        # Per-component probe cache: id(component) -> (monotonic, result)
+        self._cache = {}
+
+        # Fixed-capacity ring of recent metric snapshots: appends are
+        # O(1) with no reallocation and the oldest entry falls off once
+        # the buffer is full, so memory stays bounded on long runs
+        self.history = deque(maxlen=METRICS_HISTORY_SIZE)
+
+        # Component-name -> checker dispatch table, built once instead
+        # of re-walking an if/elif chain on every health tick
+        self._checkers = {
+            'producer': self.check_producer_health,
+            'events_consumer': self.check_consumer_health,
+            'dead_letter_consumer': self.check_dead_letter_consumer_health,
+            'sink_writer': self.check_sink_health,
+            'dead_letter_handler': self.check_dead_letter_health,
+        }
+
     def check_producer_health(self, producer: EventProducer) -> Dict[str, Any]:
         """Check producer health."""
         try:
@@ -176,42 +255,64 @@ class PipelineHealthChecker:
                 'error': str(e)
             }
     
-    def check_overall_health(self, components: Dict[str, Any]) -> Dict[str, Any]:
-        """Check overall pipeline health."""
+    def record_metrics(self, metrics: Dict[str, Any]) -> None:
+        """Append a metrics snapshot to the rolling history."""
+        self.history.append(metrics)
+
+    def get_history(self) -> List[Dict[str, Any]]:
+        """Get retained metric snapshots, oldest first."""
+        return list(self.history)
+
+    def _check_cached(self, component: Any, checker,
+                      use_cache: bool = True) -> Dict[str, Any]:
+        """Run a component probe, reusing a result younger than the TTL."""
+        now = time.monotonic()
+        key = id(component)
+
+        if use_cache:
+            hit = self._cache.get(key)
+            if hit is not None and now - hit[0] < HEALTH_CACHE_TTL:
+                return hit[1]
+
+        result = checker(component)
+        self._cache[key] = (now, result)
+        return result
+
+    def check_overall_health(self, components: Dict[str, Any],
+                             use_cache: bool = True) -> Dict[str, Any]:
+        """
+        Check overall pipeline health.
+
+        Args:
+            components: Component-name -> instance map to probe
+            use_cache: If False, re-run every probe even when a cached
+                result is still within the TTL
+        """
         health_status = {
             'timestamp': datetime.now().isoformat(),
             'overall_status': 'healthy',
             'components': {}
         }
-        
+
         # Check each component
         for name, component in components.items():
-            if name == 'producer':
-                health_status['components'][name] = self.check_producer_health(component)
-            elif name == 'events_consumer':
-                health_status['components'][name] = self.check_consumer_health(component)
-            elif name == 'dead_letter_consumer':
-                health_status['components'][name] = self.check_dead_letter_consumer_health(component)
-            elif name == 'sink_writer':
-                health_status['components'][name] = self.check_sink_health(component)
-            elif name == 'dead_letter_handler':
-                health_status['components'][name] = self.check_dead_letter_health(component)
-        
-        # Determine overall status
-        unhealthy_components = [
-            comp for comp in health_status['components'].values()
-            if comp.get('status') == 'unhealthy'
-        ]
-        
-        warning_components = [
-            comp for comp in health_status['components'].values()
-            if comp.get('status') == 'warning'
-        ]
+            checker = self._checkers.get(name)
+            if checker:
+                health_status['components'][name] = self._check_cached(
+                    component, checker, use_cache
+                )
         
-        if unhealthy_components:
-            health_status['overall_status'] = 'unhealthy'
-        elif warning_components:
-            health_status['overall_status'] = 'warning'
+        # Determine overall status as the worst severity tier seen,
+        # exiting early once nothing worse is possible
+        worst = 0
+        for component in health_status['components'].values():
+            tier = _STATUS_TIERS.get(component.get('status'), 2)
+            if tier > worst:
+                worst = tier
+                if worst == 2:
+                    break
+
+        health_status['overall_status'] = _TIER_NAMES[worst]
         
         self.health_status = health_status
         self.last_check = datetime.now()
@@ -245,13 +346,37 @@ class StreamingPipeline:
         self.sink_writer = ParquetSinkWriter()
         self.dead_letter_handler = DeadLetterHandler()
         
+        # Static component map for health checks; the instances never
+        # change after construction, so build it once
+        self._components = {
+            'producer': self.producer,
+            'events_consumer': self.consumer,
+            'dead_letter_consumer': self.dead_letter_consumer,
+            'sink_writer': self.sink_writer,
+            'dead_letter_handler': self.dead_letter_handler
+        }
+
         # Pipeline state
         self.is_running = False
         self.shutdown_event = threading.Event()
+
+        # Worker pool for the pipeline stages; created per run in
+        # start() and shut down in stop(), so a stopped pipeline can be
+        # started again with a fresh pool
+        self._executor = None
         
         # Monitoring
         self.monitoring_thread = None
         self.health_check_interval = 30  # seconds
+
+        # Rolling one-minute throughput window: one (timestamp, count)
+        # entry per processed batch, bounded so it never grows unchecked
+        self._throughput_window = deque(maxlen=600)
+
+        # Monotonic reference for elapsed-time metrics: one clock read
+        # per update instead of datetime construction and arithmetic,
+        # and immune to wall-clock adjustments
+        self._start_monotonic = time.monotonic()
         
         logger.info("Streaming pipeline initialized")
     
@@ -267,8 +392,17 @@ class StreamingPipeline:
         logger.info(f"Target rate: {events_per_second} events/second")
         
         self.is_running = True
+        self.shutdown_event.clear()
         self.metrics.start_time = datetime.now()
-        
+        self._start_monotonic = time.monotonic()
+
+        # Fresh stage pool for this run; the previous one (if any) was
+        # shut down by stop()
+        self._executor = ThreadPoolExecutor(
+            max_workers=8,
+            thread_name_prefix='pipeline'
+        )
+
         # Start monitoring thread
         self.monitoring_thread = threading.Thread(
             target=self._monitoring_loop,
@@ -277,35 +411,24 @@ class StreamingPipeline:
         self.monitoring_thread.start()
         
         try:
-            # Start producer in separate thread
-            producer_thread = threading.Thread(
-                target=self._run_producer,
-                args=(duration_seconds, events_per_second),
-                daemon=True
-            )
-            producer_thread.start()
-            
-            # Start events consumer in separate thread
-            events_consumer_thread = threading.Thread(
-                target=self._run_events_consumer,
-                args=(duration_seconds,),
-                daemon=True
-            )
-            events_consumer_thread.start()
-            
-            # Start dead letter consumer in separate thread
-            dead_letter_consumer_thread = threading.Thread(
-                target=self._run_dead_letter_consumer,
-                args=(duration_seconds,),
-                daemon=True
-            )
-            dead_letter_consumer_thread.start()
-            
-            # Wait for all threads to complete
-            producer_thread.join()
-            events_consumer_thread.join()
-            dead_letter_consumer_thread.join()
-            
+            # Submit the pipeline stages to the shared pool and wait for
+            # them all to finish
+            futures = [
+                self._executor.submit(
+                    self._run_producer, duration_seconds, events_per_second
+                ),
+                self._executor.submit(self._run_events_consumer, duration_seconds),
+                self._executor.submit(self._run_dead_letter_consumer, duration_seconds),
+            ]
+
+            # Bounded wait: the stages stop themselves at the deadline,
+            # the grace period just covers their final batch flush
+            done, _ = wait_futures(futures, timeout=duration_seconds + 5)
+
+            # Surface any stage exception that escaped the loop handlers
+            for future in done:
+                future.result()
+
         except KeyboardInterrupt:
             logger.info("Pipeline stopped by user")
         except Exception as e:
@@ -316,126 +439,219 @@ class StreamingPipeline:
     def _run_producer(self, duration_seconds: int, events_per_second: int) -> None:
         """Run the producer in a separate thread."""
         try:
-            start_time = time.time()
-            event_interval = 1.0 / events_per_second
             invalid_event_ratio = 0.05  # 5% invalid events (reduced from 10%)
-            
-            while time.time() - start_time < duration_seconds and not self.shutdown_event.is_set():
-                # Generate event (valid or invalid)
-                if fake.pyfloat() < invalid_event_ratio:
-                    event = self.producer.generate_invalid_event()
-                else:
-                    event = self.producer.generate_user_event()
-                
-                # Process event
-                success = self.producer.process_event(event)
-                
-                if success:
-                    self.metrics.events_produced += 1
-                else:
-                    self.metrics.errors += 1
-                
-                time.sleep(event_interval)
-                
+
+            # Pace with a fixed ~10ms tick instead of sleeping between
+            # individual events: per-event sleeps are bounded below by OS
+            # timer granularity, which caps throughput regardless of the
+            # requested rate. Each tick produces however many events are
+            # due since the start, so the rate stays accurate even when
+            # a tick runs long.
+            tick_interval = 0.01
+
+            # Pre-bind loop-invariant attributes as locals; the loop can
+            # run hundreds of times per second
+            gen_valid = self.producer.generate_user_event
+            gen_invalid = self.producer.generate_invalid_event
+            process_events = self.producer.process_events
+            metrics_add = self.metrics.add
+            shutdown = self.shutdown_event
+            monotonic = time.monotonic
+            random_draw = _rng.random
+
+            start_time = monotonic()
+            deadline = start_time + duration_seconds
+            next_tick = start_time
+            produced = 0
+
+            while monotonic() < deadline and not shutdown.is_set():
+                due = int((monotonic() - start_time) * events_per_second) - produced
+
+                if due > 0:
+                    # Generate events (valid or invalid) for this tick
+                    batch = [
+                        gen_invalid() if random_draw() < invalid_event_ratio else gen_valid()
+                        for _ in range(due)
+                    ]
+
+                    successes, errors = process_events(batch)
+                    metrics_add(events_produced=successes, errors=errors)
+                    produced += due
+
+                next_tick += tick_interval
+                # Interruptible pause: returns immediately on shutdown
+                shutdown.wait(max(0.0, next_tick - monotonic()))
+
         except Exception as e:
-            logger.error(f"Producer error: {e}")
+            logger.error("Producer error: %s", e)
     
     def _run_events_consumer(self, duration_seconds: int) -> None:
-        """Run the events consumer in a separate thread."""
+        """
+        Run the events consumer stage.
+
+        Polling and processing are decoupled through a small bounded
+        queue so the next Kafka fetch is already in flight while the
+        current batch is being transformed and written; the queue's
+        maxsize provides backpressure if processing falls behind.
+        """
+        batch_queue = queue.Queue(maxsize=2)
+
+        self._executor.submit(self._poll_events_loop, duration_seconds, batch_queue)
+        self._process_events_loop(batch_queue)
+
+    def _poll_events_loop(self, duration_seconds: int, batch_queue: queue.Queue) -> None:
+        """Prefetch event batches from Kafka into the batch queue."""
         try:
-            start_time = time.time()
-            
-            while time.time() - start_time < duration_seconds and not self.shutdown_event.is_set():
+            consume_batch = self.consumer.consume_batch
+            put_batch = batch_queue.put
+            shutdown = self.shutdown_event
+            monotonic = time.monotonic
+            deadline = monotonic() + duration_seconds
+
+            while monotonic() < deadline and not shutdown.is_set():
                 # Consume batch of messages from events topic
-                messages = self.consumer.consume_batch()
-                
+                messages = consume_batch()
+
                 if messages:
-                    # Process valid events (these are already validated by producer)
-                    processed, errors = self.process_valid_events(messages)
-                    
-                    self.metrics.valid_events_consumed += len(messages)
-                    self.metrics.events_transformed += processed
-                    self.metrics.errors += errors
-                    self.metrics.batches_processed += 1
-                    
-                    logger.info(f"Events batch processed: {processed} events, {errors} errors")
-                else:
-                    # No messages, sleep briefly
-                    time.sleep(0.1)
-                    
+                    put_batch(messages)
+
+        except Exception as e:
+            logger.error("Events poll error: %s", e)
+        finally:
+            # Sentinel tells the processing loop to finish
+            batch_queue.put(None)
+
+    def _process_events_loop(self, batch_queue: queue.Queue) -> None:
+        """Drain prefetched batches and run transform + sink write."""
+        try:
+            get_batch = batch_queue.get
+            process_batch = self.process_valid_events
+            window_append = self._throughput_window.append
+            metrics_add = self.metrics.add
+
+            while True:
+                messages = get_batch()
+
+                if messages is None:
+                    break
+
+                # Process valid events (these are already validated by producer)
+                processed, errors = process_batch(messages)
+
+                window_append((time.monotonic(), len(messages)))
+                metrics_add(
+                    valid_events_consumed=len(messages),
+                    events_transformed=processed,
+                    errors=errors,
+                    batches_processed=1
+                )
+
+                logger.info("Events batch processed: %d events, %d errors", processed, errors)
+
         except Exception as e:
-            logger.error(f"Events consumer error: {e}")
+            logger.error("Events consumer error: %s", e)
     
     def process_valid_events(self, messages: List[Dict[str, Any]]) -> tuple[int, int]:
         """
         Process valid events from the events topic.
-        
+
+        The whole batch is transformed columnar and written to the sink
+        as one Arrow table; only if that fails does it fall back to the
+        per-event path, which can route individual failures to the dead
+        letter handler.
+
         Args:
             messages: List of valid events to process
-            
+
         Returns:
             Tuple of (processed_count, error_count)
         """
+        if not messages:
+            return 0, 0
+
+        try:
+            table = self.transformer.transform_batch_columnar(messages)
+
+            if self.sink_writer.write_table(table):
+                self.metrics.add(events_written=len(messages))
+                return len(messages), 0
+
+        except Exception as e:
+            logger.error("Columnar batch processing failed, falling back to per-event path: %s", e)
+
+        return self._process_valid_events_individually(messages)
+
+    def _process_valid_events_individually(self, messages: List[Dict[str, Any]]) -> tuple[int, int]:
+        """
+        Per-event fallback for batches the columnar path could not handle.
+
+        Args:
+            messages: List of valid events to process
+
+        Returns:
+            Tuple of (processed_count, error_count)
+        """
+        # Accumulate counters locally and flush to the shared metrics
+        # once after the loop: one lock acquisition per batch instead of
+        # one (or more) per event
         processed = 0
         errors = 0
-        
+        dead_letters = 0
+
         for message in messages:
             try:
                 # Transform valid event
                 transformed_event = self.transformer.transform_user_event(message)
-                
+
                 # Write to Parquet sink
                 success = self.sink_writer.add_event(transformed_event)
-                
+
                 if success:
                     processed += 1
-                    self.metrics.events_written += 1
                 else:
                     errors += 1
-                    self.metrics.errors += 1
-                    
+
             except Exception as e:
                 errors += 1
-                self.metrics.errors += 1
-                
-                # Create dead letter event for processing errors
-                dead_letter_event = {
-                    "original_event": message,
-                    "error_type": type(e).__name__,
-                    "error_message": format_error_message(e),
-                    "failed_at": datetime.now().isoformat(),
-                    "processing_stage": "events_consumer_processing"
-                }
-                
-                # Process dead letter event
-                self.dead_letter_handler.process_dead_letter_event(dead_letter_event)
-                self.metrics.dead_letter_events += 1
-                
-                logger.error(f"Failed to process valid event: {e}")
-        
+
+                # Hand the failure to the background drainer; only the
+                # enqueue happens on this thread
+                self.dead_letter_handler.submit_dead_letter_event(
+                    _build_dead_letter(message, e)
+                )
+                dead_letters += 1
+
+                logger.error("Failed to process valid event: %s", e)
+
+        self.metrics.add(
+            events_written=processed,
+            errors=errors,
+            dead_letter_events=dead_letters
+        )
+
         return processed, errors
     
     def _run_dead_letter_consumer(self, duration_seconds: int) -> None:
         """Run the dead letter consumer in a separate thread."""
         try:
-            start_time = time.time()
-            
-            while time.time() - start_time < duration_seconds and not self.shutdown_event.is_set():
+            deadline = time.monotonic() + duration_seconds
+
+            while time.monotonic() < deadline and not self.shutdown_event.is_set():
                 # Consume dead letter messages from dead letter topic
                 message = self.dead_letter_consumer.consume_message(timeout=1.0)
                 
                 if message is not None:
                     # Process dead letter event (write as JSON)
                     self.process_dead_letter_event(message)
-                    self.metrics.dead_letter_events += 1
-                    self.metrics.dead_letter_events_consumed += 1 # Increment dead letter consumed count
-                    logger.warning(f"Processed dead letter event from topic")
+                    self.metrics.add(dead_letter_events=1, dead_letter_events_consumed=1)
+                    logger.warning("Processed dead letter event from topic")
                 else:
-                    # No messages, sleep briefly
-                    time.sleep(0.1)
-                    
+                    # No messages; idle until the next poll or shutdown
+                    if self.shutdown_event.wait(0.1):
+                        break
+
         except Exception as e:
-            logger.error(f"Dead letter consumer error: {e}")
+            logger.error("Dead letter consumer error: %s", e)
     
     def process_dead_letter_event(self, message: Dict[str, Any]) -> None:
         """
@@ -450,12 +666,12 @@ class StreamingPipeline:
             success = self.dead_letter_handler.process_dead_letter_event(message)
             
             if success:
-                logger.warning(f"Successfully wrote dead letter event to JSON file")
+                logger.warning("Successfully wrote dead letter event to JSON file")
             else:
-                logger.error(f"Failed to write dead letter event to JSON file")
+                logger.error("Failed to write dead letter event to JSON file")
                 
         except Exception as e:
-            logger.error(f"Failed to write dead letter event to JSON: {e}")
+            logger.error("Failed to write dead letter event to JSON: %s", e)
             # Don't create new dead letter events - just log the error
     
     def _monitoring_loop(self) -> None:
@@ -463,42 +679,56 @@ class StreamingPipeline:
         while self.is_running and not self.shutdown_event.is_set():
             try:
                 # Perform health check
-                components = {
-                    'producer': self.producer,
-                    'events_consumer': self.consumer,
-                    'dead_letter_consumer': self.dead_letter_consumer,
-                    'sink_writer': self.sink_writer,
-                    'dead_letter_handler': self.dead_letter_handler
-                }
-                
-                health_status = self.health_checker.check_overall_health(components)
+                health_status = self.health_checker.check_overall_health(self._components)
                 
-                # Log health status
+                # Log health status; the dump is guarded so the health
+                # dict is only serialized when WARNING is actually emitted,
+                # and compact separators skip the pretty-print cost
                 if health_status['overall_status'] != 'healthy':
-                    logger.warning(f"Pipeline health check: {health_status['overall_status']}")
-                    logger.warning(f"Health details: {json.dumps(health_status, indent=2)}")
+                    logger.warning("Pipeline health check: %s", health_status['overall_status'])
+                    if logger.isEnabledFor(logging.WARNING):
+                        logger.warning(
+                            "Health details: %s",
+                            json.dumps(health_status, separators=(',', ':'))
+                        )
                 
                 # Update processing time
                 self.metrics.processing_time_seconds = (
-                    datetime.now() - self.metrics.start_time
-                ).total_seconds()
-                
-                # Sleep until next check
-                time.sleep(self.health_check_interval)
+                    time.monotonic() - self._start_monotonic
+                )
+
+                # Record a snapshot for trend inspection
+                self.health_checker.record_metrics(self.metrics.to_dict())
                 
+                # Sleep until next check, waking immediately on shutdown
+                if self.shutdown_event.wait(self.health_check_interval):
+                    break
+
             except Exception as e:
-                logger.error(f"Monitoring error: {e}")
-                time.sleep(5)  # Brief sleep on error
+                logger.error("Monitoring error: %s", e)
+                self.shutdown_event.wait(5)  # Brief sleep on error
     
     def get_metrics(self) -> Dict[str, Any]:
         """Get current pipeline metrics."""
         metrics_dict = self.metrics.to_dict()
+        # Serialize once here so consumers get a plain JSON-ready dict
+        metrics_dict['start_time'] = self.metrics.start_time.isoformat()
         metrics_dict['success_rate'] = self.metrics.get_success_rate()
         metrics_dict['error_rate'] = self.metrics.get_error_rate()
         metrics_dict['events_per_second'] = (
             self.metrics.get_total_consumed() / 
             max(self.metrics.processing_time_seconds, 1)
         )
+
+        # Rolling throughput over the last minute, so bursts are not
+        # flattened by the cumulative average above
+        cutoff = time.monotonic() - 60.0
+        recent = sum(
+            count for timestamp, count in self._throughput_window
+            if timestamp >= cutoff
+        )
+        metrics_dict['rolling_events_per_second'] = recent / 60.0
+
         return metrics_dict
     
     def get_health_status(self) -> Dict[str, Any]:
@@ -538,20 +768,24 @@ class StreamingPipeline:
             # Wait for monitoring thread
             if self.monitoring_thread and self.monitoring_thread.is_alive():
                 self.monitoring_thread.join(timeout=5)
-            
+
+            # Shut down this run's stage pool; futures still queued are
+            # dropped. start() builds a new pool for the next run
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
         except Exception as e:
             logger.error(f"Error stopping pipeline: {e}")
         
-        # Log final metrics
+        # Log final metrics; default=str covers any remaining
+        # non-JSON value instead of special-casing start_time
         final_metrics = self.get_metrics()
-        # Convert datetime to ISO string for JSON serialization
-        if 'start_time' in final_metrics and isinstance(final_metrics['start_time'], (str, int)) is False:
-            final_metrics['start_time'] = final_metrics['start_time'].isoformat()
-        logger.info(f"Pipeline stopped. Final metrics: {json.dumps(final_metrics, indent=2)}")
+        logger.info("Pipeline stopped. Final metrics: %s", json.dumps(final_metrics, indent=2, default=str))
         
         self.metrics.processing_time_seconds = (
-            datetime.now() - self.metrics.start_time
-        ).total_seconds()
+            time.monotonic() - self._start_monotonic
+        )
 
 
 def run_pipeline_demo(duration_seconds: int = 60, events_per_second: int = 5) -> None:
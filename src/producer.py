@@ -1,21 +1,97 @@
 """
 Event producer service that generates synthetic events and publishes to Kafka.
 """
-import json
+import os
+import random
+import threading
 import time
 import logging
-from typing import Dict, Any, Optional
-from datetime import datetime
+from typing import Dict, Any, List, Optional
+import orjson
 from faker import Faker
 from confluent_kafka import Producer, KafkaException
+from jsonschema import ValidationError
 
 from src.config import PRODUCER_CONFIG, TOPICS
-from src.utils import setup_logging, format_error_message
+from src.utils import setup_logging, format_error_message, now_iso
 from schema.schema_validator import SchemaValidator
 
 # Setup logging
 logger = setup_logging(__name__)
-fake = Faker()
+
+# Each worker thread gets its own Faker; instances carry internal random
+# state, so sharing one across threads would serialize generation
+_thread_local = threading.local()
+
+
+def _local_faker() -> Faker:
+    """Return this thread's Faker instance, creating it on first use."""
+    faker = getattr(_thread_local, 'faker', None)
+    if faker is None:
+        faker = Faker()
+        _thread_local.faker = faker
+    return faker
+
+
+def _hex_id() -> str:
+    """
+    Generate a random 32-char hex id from a pooled os.urandom buffer.
+
+    Each worker thread refills its own pool in 4KB chunks, so most ids
+    skip the per-call urandom syscall that uuid.uuid4 pays; these ids
+    only need uniqueness, not RFC 4122 framing.
+    """
+    pool = getattr(_thread_local, 'id_pool', b'')
+    offset = getattr(_thread_local, 'id_pool_offset', 0)
+
+    if offset + 16 > len(pool):
+        pool = os.urandom(4096)
+        offset = 0
+        _thread_local.id_pool = pool
+
+    _thread_local.id_pool_offset = offset + 16
+    return pool[offset:offset + 16].hex()
+
+
+_EVENT_TYPES = ("page_view", "click", "purchase", "signup", "login", "logout")
+
+# Frozenset view of the valid event types for the validation fast path:
+# a single hash probe rejects bad event_type values without paying for
+# the full schema walk
+_VALID_EVENT_TYPES = frozenset(_EVENT_TYPES)
+
+# Precomputed prefix for the fast-path rejection message; one concat
+# per invalid event instead of f-string formatting machinery. Phrased
+# like the validator's enum errors ("must be one of [...]") so the dead
+# letter categorizer files these as invalid_enum_value
+_INVALID_TYPE_MSG = f"event_type must be one of {list(_EVENT_TYPES)}, got "
+
+# Faker's pure-Python providers are far too slow to call per event, so
+# events sample from fixed pools of pre-generated values instead; the
+# pools are built once per process, on first use, and shared
+_POOL_SIZE = 1000
+_field_pools = None
+_field_pools_lock = threading.Lock()
+
+
+def _get_field_pools() -> Dict[str, List[str]]:
+    """Return the shared field-value pools, building them on first use."""
+    global _field_pools
+
+    pools = _field_pools
+    if pools is None:
+        with _field_pools_lock:
+            pools = _field_pools
+            if pools is None:
+                fake = _local_faker()
+                pools = {
+                    'page_url': [fake.url() for _ in range(_POOL_SIZE)],
+                    'user_agent': [fake.user_agent() for _ in range(_POOL_SIZE)],
+                    'ip_address': [fake.ipv4() for _ in range(_POOL_SIZE)],
+                    'country': [fake.country() for _ in range(_POOL_SIZE)],
+                }
+                _field_pools = pools
+    return pools
 
 
 class EventProducer:
@@ -34,8 +110,15 @@ class EventProducer:
         self.config = config or PRODUCER_CONFIG
         self.producer = Producer(self.config)
         self.validator = SchemaValidator()
+        # Bind the compiled validator once; validate_event runs per event
+        self._validate_user_event = self.validator.validate_user_event
+        # Topic names resolved once; attribute reads beat dict lookups
+        # in the per-event path
+        self._events_topic = TOPICS['events']
+        self._dead_letter_topic = TOPICS['dead_letter']
         self.event_count = 0
         self.error_count = 0
+        self._unpolled = 0
         
         logger.info("Event producer initialized")
     
@@ -46,51 +129,52 @@ class EventProducer:
         Returns:
             Dict containing event data
         """
-        event_types = ["page_view", "click", "purchase", "signup", "login", "logout"]
-        event_type = fake.random_element(event_types)
-        
+        pools = _get_field_pools()
+        choice = random.choice
+        event_type = choice(_EVENT_TYPES)
+
         # Base event structure
         event = {
-            "user_id": fake.uuid4(),
+            "user_id": _hex_id(),
             "event_type": event_type,
-            "timestamp": datetime.now().isoformat(),
-            "session_id": fake.uuid4(),
+            "timestamp": now_iso(),
+            "session_id": _hex_id(),
             "source": "web",
             "version": "1.0"
         }
-        
+
         # Add event-specific data
         if event_type == "page_view":
             event.update({
-                "page_url": fake.url(),
-                "user_agent": fake.user_agent(),
-                "ip_address": fake.ipv4(),
-                "country": fake.country()
+                "page_url": choice(pools['page_url']),
+                "user_agent": choice(pools['user_agent']),
+                "ip_address": choice(pools['ip_address']),
+                "country": choice(pools['country'])
             })
         elif event_type == "click":
             event.update({
-                "page_url": fake.url(),
-                "element_id": f"btn_{fake.random_int(min=1, max=100)}",
-                "user_agent": fake.user_agent(),
-                "ip_address": fake.ipv4()
+                "page_url": choice(pools['page_url']),
+                "element_id": f"btn_{random.randint(1, 100)}",
+                "user_agent": choice(pools['user_agent']),
+                "ip_address": choice(pools['ip_address'])
             })
         elif event_type == "purchase":
             event.update({
-                "product_id": f"prod_{fake.random_int(min=1, max=1000)}",
-                "amount": round(fake.pyfloat(left_digits=3, right_digits=2, positive=True, min_value=10.0, max_value=500.0), 2),
-                "page_url": fake.url(),
-                "user_agent": fake.user_agent(),
-                "ip_address": fake.ipv4(),
-                "country": fake.country()
+                "product_id": f"prod_{random.randint(1, 1000)}",
+                "amount": round(random.uniform(10.0, 500.0), 2),
+                "page_url": choice(pools['page_url']),
+                "user_agent": choice(pools['user_agent']),
+                "ip_address": choice(pools['ip_address']),
+                "country": choice(pools['country'])
             })
-        elif event_type in ["signup", "login", "logout"]:
+        elif event_type in ("signup", "login", "logout"):
             event.update({
-                "page_url": fake.url(),
-                "user_agent": fake.user_agent(),
-                "ip_address": fake.ipv4(),
-                "country": fake.country()
+                "page_url": choice(pools['page_url']),
+                "user_agent": choice(pools['user_agent']),
+                "ip_address": choice(pools['ip_address']),
+                "country": choice(pools['country'])
             })
-        
+
         return event
     
     def generate_invalid_event(self) -> Dict[str, Any]:
@@ -118,11 +202,20 @@ class EventProducer:
         Returns:
             Tuple of (is_valid, error_message)
         """
+        # Fast path: event_type is the field deliberately broken by the
+        # invalid-event generator, so reject on it with one set lookup
+        # before invoking the compiled schema validator
+        event_type = event.get('event_type')
+        if event_type not in _VALID_EVENT_TYPES:
+            return False, _INVALID_TYPE_MSG + str(event_type)
+
         try:
-            self.validator.validate_user_event(event)
+            self._validate_user_event(event)
             return True, None
-        except Exception as e:
-            return False, str(e)
+        except ValidationError as e:
+            # Only schema violations are expected here; anything else
+            # (e.g. a broken schema file) should propagate
+            return False, e.message
     
     def publish_event(self, event: Dict[str, Any], topic: str) -> bool:
         """
@@ -136,31 +229,55 @@ class EventProducer:
             bool: True if published successfully
         """
         try:
-            # Serialize event to JSON
-            event_json = json.dumps(event)
-            
+            # Serialize straight to bytes; no intermediate str + encode copy
+            event_json = orjson.dumps(event)
+
             # Publish to Kafka
-            self.producer.produce(
-                topic=topic,
-                value=event_json.encode('utf-8'),
-                callback=self._delivery_report
-            )
-            
-            # Flush to ensure delivery
-            self.producer.poll(0)
-            
+            self._produce(topic, event_json)
+
             return True
             
         except Exception as e:
             logger.error(f"Failed to publish event: {e}")
             return False
     
+    def _produce(self, topic: str, value: bytes) -> None:
+        """
+        Produce one message, absorbing local queue backpressure.
+
+        When librdkafka's buffer is full, produce raises BufferError;
+        serving delivery callbacks drains the queue, then the produce is
+        retried.
+
+        Args:
+            topic: Kafka topic name
+            value: Serialized message payload
+        """
+        while True:
+            try:
+                self.producer.produce(
+                    topic=topic,
+                    value=value,
+                    callback=self._delivery_report
+                )
+                break
+            except BufferError:
+                self.producer.poll(0.05)
+
+        # Serve delivery callbacks periodically instead of once per
+        # event; a poll(0) after every produce forces a syscall that
+        # defeats linger.ms batching
+        self._unpolled += 1
+        if self._unpolled >= 1000:
+            self._unpolled = 0
+            self.producer.poll(0)
+
     def _delivery_report(self, err, msg):
         """Handle delivery reports from Kafka."""
         if err is not None:
             logger.error(f"Message delivery failed: {err}")
         else:
-            logger.debug(f"Message delivered to {msg.topic()} [{msg.partition()}]")
+            logger.debug("Message delivered to %s [%s]", msg.topic(), msg.partition())
     
     def process_event(self, event: Dict[str, Any]) -> bool:
         """
@@ -173,82 +290,195 @@ class EventProducer:
             bool: True if processed successfully
         """
         try:
-            # Validate event
-            is_valid, error_message = self.validate_event(event)
-            
-            if not is_valid:
-                logger.warning(f"Invalid event: {error_message}")
-                self.error_count += 1
-                
-                # Send to dead letter topic
-                dead_letter_event = {
-                    "original_event": event,
-                    "error_type": "validation_error",
-                    "error_message": error_message,
-                    "failed_at": datetime.now().isoformat(),
-                    "processing_stage": "producer_validation"
-                }
-                
-                self.producer.produce(
-                    topic=TOPICS['dead_letter'],
-                    value=json.dumps(dead_letter_event),
-                    callback=self._delivery_report
-                )
-                
-                return False
-            
-            # Publish to events topic (no partition key)
-            self.producer.produce(
-                topic=TOPICS['events'],
-                value=json.dumps(event),
-                callback=self._delivery_report
-            )
-            
-            self.event_count += 1
-            logger.debug(f"Event sent: {event.get('event_id', 'unknown')}")
-            return True
+            if self._route_event(event):
+                self.event_count += 1
+                return True
+            self.error_count += 1
+            return False
         except Exception as e:
             self.error_count += 1
             error_message = format_error_message(e)
             logger.error(f"Failed to send event: {error_message}")
             return False
+
+    def _route_event(self, event: Dict[str, Any]) -> bool:
+        """
+        Validate an event and publish it to the appropriate topic.
+
+        Invalid events are routed to the dead letter topic. Counters are
+        left to the caller so worker threads can keep lock-free local
+        tallies.
+
+        Args:
+            event: Event data to route
+
+        Returns:
+            bool: True if the event was valid and published
+        """
+        is_valid, error_message = self.validate_event(event)
+
+        if not is_valid:
+            logger.warning(f"Invalid event: {error_message}")
+
+            # Send to dead letter topic
+            dead_letter_event = {
+                "original_event": event,
+                "error_type": "validation_error",
+                "error_message": error_message,
+                "failed_at": now_iso(),
+                "processing_stage": "producer_validation"
+            }
+
+            self._produce(self._dead_letter_topic, orjson.dumps(dead_letter_event))
+
+            return False
+
+        # Publish to events topic (no partition key)
+        self._produce(self._events_topic, orjson.dumps(event))
+
+        logger.debug("Event sent: %s", event.get('event_id', 'unknown'))
+        return True
     
-    def run(self, duration_seconds: int = 60, events_per_second: int = 10, 
-            invalid_event_ratio: float = 0.1) -> None:
+    def process_events(self, events: List[Dict[str, Any]]) -> tuple[int, int]:
+        """
+        Process a batch of events.
+
+        Args:
+            events: Events to validate and publish
+
+        Returns:
+            Tuple of (success_count, error_count)
+        """
+        successes = 0
+
+        for event in events:
+            if self.process_event(event):
+                successes += 1
+
+        return successes, len(events) - successes
+
+    def _poll_loop(self, stop: threading.Event) -> None:
+        """Serve delivery callbacks for all workers from one thread."""
+        poll = self.producer.poll
+        while not stop.is_set():
+            poll(0.1)
+
+    def _worker_loop(self, stop: threading.Event, deadline: float,
+                     event_interval: float, invalid_event_ratio: float,
+                     counters: List[tuple], index: int) -> None:
+        """
+        Generate and publish events until the deadline.
+
+        Each worker keeps local counters so the hot path takes no locks;
+        run() sums them into the shared totals once the workers join.
+
+        Args:
+            stop: Event signalling early shutdown
+            deadline: Monotonic time at which to stop
+            event_interval: Seconds between events for this worker
+            invalid_event_ratio: Ratio of invalid events to generate
+            counters: Shared list receiving (events, errors) per worker
+            index: This worker's slot in counters
+        """
+        # Pre-bind the loop-invariant lookups; every dot costs a
+        # dict probe on each of the (potentially thousands of) events
+        # this loop sends per second
+        random_draw = random.Random().random
+        generate_valid = self.generate_user_event
+        generate_invalid = self.generate_invalid_event
+        route_event = self._route_event
+        monotonic = time.monotonic
+        wait = stop.wait
+
+        events = 0
+        errors = 0
+        next_event = monotonic()
+
+        while not stop.is_set() and monotonic() < deadline:
+            # Produce every event currently due back to back so
+            # librdkafka can assemble real batches instead of draining
+            # one message per OS-timer wakeup
+            while monotonic() >= next_event:
+                # Generate event (valid or invalid)
+                if random_draw() < invalid_event_ratio:
+                    event = generate_invalid()
+                else:
+                    event = generate_valid()
+
+                try:
+                    if route_event(event):
+                        events += 1
+                    else:
+                        errors += 1
+                except Exception as e:
+                    errors += 1
+                    logger.error(f"Failed to send event: {e}")
+
+                next_event += event_interval
+
+            wait(min(event_interval, max(0.0, next_event - monotonic())))
+
+        counters[index] = (events, errors)
+
+    def run(self, duration_seconds: int = 60, events_per_second: int = 10,
+            invalid_event_ratio: float = 0.1, num_workers: int = 4) -> None:
         """
         Run the producer for a specified duration.
-        
+
+        Event generation fans out over num_workers threads that share the
+        single librdkafka producer (its produce path is thread-safe), while
+        a dedicated poller thread serves delivery callbacks.
+
         Args:
             duration_seconds: How long to run (seconds)
-            events_per_second: Events to generate per second
+            events_per_second: Events to generate per second (across all workers)
             invalid_event_ratio: Ratio of invalid events to generate
+            num_workers: Number of generator threads
         """
         logger.info(f"Starting producer for {duration_seconds} seconds")
-        logger.info(f"Generating {events_per_second} events/second")
+        logger.info(f"Generating {events_per_second} events/second across {num_workers} workers")
         logger.info(f"Invalid event ratio: {invalid_event_ratio}")
-        
-        start_time = time.time()
-        event_interval = 1.0 / events_per_second
-        
+
+        # Prewarm the shared field pools before the clock starts so the
+        # first event doesn't eat the Faker pool build inside the
+        # rate-controlled loop
+        _get_field_pools()
+
+        deadline = time.monotonic() + duration_seconds
+        event_interval = num_workers / events_per_second
+
+        stop = threading.Event()
+        poller = threading.Thread(
+            target=self._poll_loop, args=(stop,),
+            name="producer-poller", daemon=True
+        )
+        counters = [(0, 0)] * num_workers
+        workers = [
+            threading.Thread(
+                target=self._worker_loop,
+                args=(stop, deadline, event_interval, invalid_event_ratio,
+                      counters, index),
+                name=f"producer-worker-{index}", daemon=True
+            )
+            for index in range(num_workers)
+        ]
+
         try:
-            while time.time() - start_time < duration_seconds:
-                # Generate event (valid or invalid)
-                if fake.random_float() < invalid_event_ratio:
-                    event = self.generate_invalid_event()
-                else:
-                    event = self.generate_user_event()
-                
-                # Process event
-                self.process_event(event)
-                
-                # Sleep to maintain event rate
-                time.sleep(event_interval)
-                
+            poller.start()
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
         except KeyboardInterrupt:
             logger.info("Producer stopped by user")
         except Exception as e:
             logger.error(f"Producer error: {e}")
         finally:
+            stop.set()
+            poller.join()
+            for events, errors in counters:
+                self.event_count += events
+                self.error_count += errors
             # Flush remaining messages
             self.producer.flush()
             logger.info(f"Producer finished. Events: {self.event_count}, Errors: {self.error_count}")
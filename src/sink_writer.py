@@ -3,9 +3,13 @@ Parquet sink writer for storing transformed events efficiently.
 """
 import os
 import logging
+import threading
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List, Optional
 from datetime import datetime
+import orjson
 import pyarrow as pa
 import pyarrow.parquet as pq
 from pyarrow import Table
@@ -15,6 +19,27 @@ from src.utils import setup_logging
 
 logger = setup_logging(__name__)
 
+# Tables at or above this row count are encoded on the background pool;
+# smaller writes stay inline to avoid pointless dispatch overhead
+PARALLEL_WRITE_THRESHOLD = 1000
+
+# Dead letter NDJSON files rotate once they grow past this many bytes
+DEAD_LETTER_FILE_MAX_BYTES = 64 * 1024 * 1024
+
+# Columns worth dictionary-encoding: the low-cardinality categorical
+# fields. Effectively-unique columns (event_id, user_id, session_id,
+# timestamps) are excluded so the encoder does not build dictionaries
+# it will immediately abandon. Names missing from a batch are ignored.
+DICTIONARY_COLUMNS = [
+    'event_type',
+    'normalized_event_type',
+    'event_category',
+    'source',
+    'version',
+    'processing_version',
+    'country',
+]
+
 
 class ParquetSinkWriter:
     """
@@ -27,17 +52,58 @@ class ParquetSinkWriter:
     - Compression for storage efficiency
     """
     
-    def __init__(self, output_dir: str = None, batch_size: int = None):
-        """Initialize the Parquet sink writer."""
+    def __init__(self, output_dir: str = None, batch_size: int = None,
+                 schema: Optional[pa.Schema] = None):
+        """
+        Initialize the Parquet sink writer.
+
+        Args:
+            output_dir: Directory for Parquet output files
+            batch_size: Events buffered before a flush
+            schema: Optional fixed Arrow schema for the dict ingest
+                path. When set, batches are cast straight into it and
+                the per-flush type inference walk over every row is
+                skipped; when None, types are inferred per batch so
+                heterogeneous events keep working
+        """
         self.output_dir = output_dir or OUTPUT_DIR
         self.batch_size = batch_size or BATCH_SIZE
+        self.schema = schema
+        self.batch_timeout = BATCH_TIMEOUT_SECONDS
         self.current_batch = []
+        # Coalescing deadline: a partial batch is flushed once it has
+        # been sitting this long, so a quiet stream still reaches disk
+        self._last_flush = time.monotonic()
         self.file_count = 0
         self.total_events_written = 0
-        
+        # Failed background writes, collected from finished futures;
+        # synchronous failures are reported to the caller directly
+        self.write_failures = 0
+
+        # Parquet encoding and compression release the GIL, so large
+        # tables are written on a small thread pool to overlap encodes
+        self._write_executor = ThreadPoolExecutor(
+            max_workers=min(4, os.cpu_count() or 1),
+            thread_name_prefix='parquet-write'
+        )
+        self._pending_writes = []
+
+        # Single long-lived Parquet writer: opened lazily with the first
+        # batch's schema, appended to as row groups, rotated only when
+        # the schema changes, and closed (footer written) on close()
+        self._writer = None
+        self._writer_schema = None
+        self._writer_filename = None
+        self._writer_lock = threading.Lock()
+
+        # Rotate to a fresh file once this many rows accumulate, so
+        # files stay a manageable size for downstream readers
+        self._rows_in_file = 0
+        self._file_target_rows = 1_000_000
+
         # Ensure output directory exists
         os.makedirs(self.output_dir, exist_ok=True)
-        
+
         logger.info(f"Parquet sink writer initialized: {self.output_dir}")
     
     def add_event(self, event: Dict[str, Any]) -> bool:
@@ -52,9 +118,11 @@ class ParquetSinkWriter:
         """
         try:
             self.current_batch.append(event)
-            
-            # Check if batch is full
-            if len(self.current_batch) >= self.batch_size:
+
+            # Flush when the batch is full, or when a partial batch has
+            # aged past the timeout so low-rate streams still flush
+            if (len(self.current_batch) >= self.batch_size
+                    or time.monotonic() - self._last_flush >= self.batch_timeout):
                 self.flush_batch()
             
             return True
@@ -74,13 +142,164 @@ class ParquetSinkWriter:
             int: Number of events successfully added
         """
         added_count = 0
-        
+
         for event in events:
             if self.add_event(event):
                 added_count += 1
-        
+
         return added_count
-    
+
+    def add_events_bulk(self, events: List[Dict[str, Any]]) -> int:
+        """
+        Add a whole list of events at once.
+
+        Unlike add_events, this extends the batch in one call and flushes
+        full batch_size chunks directly, skipping the per-event batch
+        size check.
+
+        Args:
+            events: List of transformed events
+
+        Returns:
+            int: Number of events successfully buffered or written
+        """
+        added_count = len(events)
+        self.current_batch.extend(events)
+
+        while len(self.current_batch) >= self.batch_size:
+            chunk = self.current_batch[:self.batch_size]
+            del self.current_batch[:self.batch_size]
+
+            if not self._flush_chunk(chunk):
+                added_count -= len(chunk)
+
+        return added_count
+
+    def write_batch(self, events: List[Dict[str, Any]]) -> bool:
+        """
+        Write a batch of events to a Parquet file in one columnar conversion.
+
+        Unlike the per-event add_event path, this converts the whole batch
+        with a single RecordBatch build, amortizing Arrow conversion and
+        Parquet encoding across all rows.
+
+        Args:
+            events: List of transformed events to write
+
+        Returns:
+            bool: True if batch written successfully
+        """
+        if not events:
+            logger.debug("No events in batch to write")
+            return True
+
+        try:
+            # Convert the whole batch at once
+            batch = pa.RecordBatch.from_pylist(events)
+        except Exception as e:
+            logger.error(f"Failed to write batch: {e}")
+            return False
+
+        return self.write_table(Table.from_batches([batch]))
+
+    def write_table(self, table: Table) -> bool:
+        """
+        Write an already-columnar Arrow table straight to a Parquet file.
+
+        Used by the columnar transform path, which produces Arrow tables
+        directly and skips the dict round-trip entirely.
+
+        Args:
+            table: Arrow table of transformed events
+
+        Returns:
+            bool: True if table written successfully
+        """
+        if table.num_rows == 0:
+            logger.debug("No rows in table to write")
+            return True
+
+        if table.num_rows >= PARALLEL_WRITE_THRESHOLD:
+            # Large table: encode on the pool so overlapping writes run
+            # in parallel; failures surface through write_failures when
+            # finished futures are reaped here and in close()
+            self._reap_completed_writes()
+            self._pending_writes.append(
+                self._write_executor.submit(self._write_table_file, table)
+            )
+            return True
+
+        return self._write_table_file(table)
+
+    def _reap_completed_writes(self) -> None:
+        """Prune finished background writes, counting any that failed."""
+        still_pending = []
+
+        for future in self._pending_writes:
+            if future.done():
+                # The worker catches its own exceptions and returns a
+                # bool, so result() cannot raise here
+                if not future.result():
+                    self.write_failures += 1
+            else:
+                still_pending.append(future)
+
+        self._pending_writes = still_pending
+
+    def _write_table_file(self, table: Table) -> bool:
+        """Append one Arrow table to the long-lived Parquet writer."""
+        try:
+            with self._writer_lock:
+                if self._writer is None or self._writer_schema != table.schema:
+                    self._open_writer(table.schema)
+
+                # Appends a row group; no file open or footer rewrite
+                self._writer.write_table(table, row_group_size=10000)
+
+                self._rows_in_file += table.num_rows
+                if self._rows_in_file >= self._file_target_rows:
+                    self._writer.close()
+                    self._writer = None
+                    self._writer_schema = None
+
+            self.total_events_written += table.num_rows
+
+            logger.info(f"Wrote {table.num_rows} events to {self._writer_filename}")
+
+            return True
+
+        except Exception as e:
+            logger.error(f"Failed to write table: {e}")
+            return False
+
+    def _open_writer(self, schema: pa.Schema) -> None:
+        """Open a new Parquet file for row-group appends (caller holds the lock)."""
+        if self._writer is not None:
+            self._writer.close()
+
+        # Create filename with timestamp and UUID
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        file_uuid = str(uuid.uuid4())[:8]
+        self._writer_filename = f"events_{timestamp}_{file_uuid}.parquet"
+        filepath = os.path.join(self.output_dir, self._writer_filename)
+
+        # zstd level 3 roughly halves output size versus snappy at
+        # comparable throughput; PyArrow readers decode it transparently.
+        # Dictionary encoding is limited to the categorical columns, and
+        # statistics stay on so readers can prune row groups on min/max
+        self._writer = pq.ParquetWriter(
+            filepath,
+            schema,
+            compression='zstd',
+            compression_level=3,
+            use_dictionary=DICTIONARY_COLUMNS,
+            data_page_size=1 << 20,
+            write_statistics=True
+        )
+        self._writer_schema = schema
+        self._rows_in_file = 0
+        self.file_count += 1
+
     def flush_batch(self) -> bool:
         """
         Flush the current batch to a Parquet file.
@@ -88,126 +307,60 @@ class ParquetSinkWriter:
         Returns:
             bool: True if batch written successfully
         """
+        self._last_flush = time.monotonic()
+
         if not self.current_batch:
             logger.debug("No events in batch to flush")
             return True
-        
+
+        if not self._flush_chunk(self.current_batch):
+            return False
+
+        logger.debug("Total events written: %d", self.total_events_written)
+
+        # Clear the batch
+        self.current_batch = []
+
+        return True
+
+    def _flush_chunk(self, events: List[Dict[str, Any]]) -> bool:
+        """
+        Convert one chunk of events and append it to the writer.
+
+        Args:
+            events: Events to write as a single table
+
+        Returns:
+            bool: True if the chunk was written successfully
+        """
         try:
-            # Create filename with timestamp and UUID
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            file_uuid = str(uuid.uuid4())[:8]
-            filename = f"events_{timestamp}_{file_uuid}.parquet"
-            filepath = os.path.join(self.output_dir, filename)
-            
-            # Convert batch to PyArrow Table
-            table = self._batch_to_table(self.current_batch)
-            
-            # Write to Parquet with compression
-            pq.write_table(
-                table,
-                filepath,
-                compression='snappy',
-                row_group_size=10000
-            )
-            
-            batch_size = len(self.current_batch)
-            self.total_events_written += batch_size
-            self.file_count += 1
-            
-            logger.info(f"Wrote batch of {batch_size} events to {filename}")
-            logger.debug(f"Total events written: {self.total_events_written}")
-            
-            # Clear the batch
-            self.current_batch = []
-            
-            return True
-            
+            # Convert chunk to PyArrow Table
+            table = self._batch_to_table(events)
         except Exception as e:
             logger.error(f"Failed to flush batch: {e}")
             return False
+
+        # Append to the long-lived writer as a row group rather than
+        # paying a file create + footer per batch
+        return self._write_table_file(table)
     
     def _batch_to_table(self, events: List[Dict[str, Any]]) -> Table:
         """
         Convert a batch of events to a PyArrow Table.
-        
+
         Args:
             events: List of event dictionaries
-            
+
         Returns:
             PyArrow Table
         """
-        # Convert events to list of lists for PyArrow
-        columns = {}
-        
-        # Get all unique keys from all events
-        all_keys = set()
-        for event in events:
-            all_keys.update(event.keys())
-        
-        # Initialize columns
-        for key in all_keys:
-            columns[key] = []
-        
-        # Fill columns with data
-        for event in events:
-            for key in all_keys:
-                value = event.get(key)
-                columns[key].append(value)
-        
-        # Create PyArrow arrays
-        arrays = []
-        field_names = []
-        
-        for key, values in columns.items():
-            # Determine appropriate PyArrow type
-            pa_type = self._infer_pyarrow_type(values)
-            arrays.append(pa.array(values, type=pa_type))
-            field_names.append(key)
-        
-        # Create schema and table
-        schema = pa.schema([pa.field(name, array.type) for name, array in zip(field_names, arrays)])
-        table = pa.table(arrays, schema=schema)
-        
-        return table
-    
-    def _infer_pyarrow_type(self, values: List[Any]) -> pa.DataType:
-        """
-        Infer the appropriate PyArrow data type from a list of values.
-        
-        Args:
-            values: List of values to infer type from
-            
-        Returns:
-            PyArrow data type
-        """
-        # Check if all values are None
-        if all(v is None for v in values):
-            return pa.null()
-        
-        # Get non-None values
-        non_null_values = [v for v in values if v is not None]
-        
-        if not non_null_values:
-            return pa.null()
-        
-        # Check types
-        sample_value = non_null_values[0]
-        
-        if isinstance(sample_value, bool):
-            return pa.bool_()
-        elif isinstance(sample_value, int):
-            return pa.int64()
-        elif isinstance(sample_value, float):
-            return pa.float64()
-        elif isinstance(sample_value, str):
-            return pa.string()
-        elif isinstance(sample_value, dict):
-            return pa.struct([])  # Simplified for now
-        elif isinstance(sample_value, list):
-            return pa.list_(pa.string())  # Simplified for now
-        else:
-            return pa.string()  # Default to string
-    
+        # With a pinned schema PyArrow casts values straight into the
+        # declared column types, skipping inference entirely; otherwise
+        # it unions the keys, fills missing values with null, and infers
+        # column types natively - either way no Python-level passes over
+        # the batch are needed
+        return Table.from_pylist(events, schema=self.schema)
+
     def close(self) -> bool:
         """
         Close the writer and flush any remaining events.
@@ -219,7 +372,22 @@ class ParquetSinkWriter:
             if self.current_batch:
                 logger.info(f"Flushing final batch of {len(self.current_batch)} events")
                 self.flush_batch()
-            
+
+            # Wait for any in-flight background writes to finish,
+            # counting the ones that failed
+            for future in self._pending_writes:
+                if not future.result():
+                    self.write_failures += 1
+            self._pending_writes = []
+            self._write_executor.shutdown(wait=True)
+
+            # Close the long-lived writer, which writes the Parquet footer
+            with self._writer_lock:
+                if self._writer is not None:
+                    self._writer.close()
+                    self._writer = None
+                    self._writer_schema = None
+
             logger.info(f"Sink writer closed. Total events written: {self.total_events_written}")
             return True
             
@@ -238,6 +406,7 @@ class ParquetSinkWriter:
             "total_events_written": self.total_events_written,
             "files_written": self.file_count,
             "current_batch_size": len(self.current_batch),
+            "write_failures": self.write_failures,
             "output_directory": self.output_dir
         }
 
@@ -245,55 +414,120 @@ class ParquetSinkWriter:
 class DeadLetterSinkWriter:
     """
     Sink writer for dead letter events.
-    
-    Writes failed events to JSON files for debugging and potential reprocessing.
+
+    Appends failed events to a rotating NDJSON file (one JSON document
+    per line) for debugging and potential reprocessing. A single
+    buffered file handle serves all writes, so the filesystem sees one
+    create per rotation instead of one per event.
     """
-    
-    def __init__(self, output_dir: str = None):
-        """Initialize the dead letter sink writer."""
+
+    def __init__(self, output_dir: str = None, is_null: bool = False):
+        """
+        Initialize the dead letter sink writer.
+
+        Args:
+            output_dir: Directory for dead letter files
+            is_null: If True, the writer is a dry-run sink that discards
+                events; callers can check this flag to skip work whose
+                output would be thrown away
+        """
         self.output_dir = output_dir or os.path.join(OUTPUT_DIR, "dead_letters")
         self.event_count = 0
-        
-        # Ensure output directory exists
-        os.makedirs(self.output_dir, exist_ok=True)
-        
+        self.is_null = is_null
+
+        # Opened lazily with the first event so a writer that never sees
+        # a dead letter leaves no empty file behind
+        self._fh = None
+        self._bytes_written = 0
+
+        if not self.is_null:
+            # Ensure output directory exists
+            os.makedirs(self.output_dir, exist_ok=True)
+
         logger.info(f"Dead letter sink writer initialized: {self.output_dir}")
-    
+
+    def _open_file(self):
+        """Open a fresh NDJSON file and return its buffered handle."""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        file_uuid = str(uuid.uuid4())[:8]
+        filename = f"dead_letter_{timestamp}_{file_uuid}.ndjson"
+        filepath = os.path.join(self.output_dir, filename)
+
+        self._fh = open(filepath, 'ab', buffering=1 << 16)
+        self._bytes_written = 0
+        logger.info(f"Opened dead letter file: {filename}")
+
+        return self._fh
+
+    def _append(self, data: bytes) -> None:
+        """Append serialized lines, rotating the file on size rollover."""
+        fh = self._fh or self._open_file()
+        self._bytes_written += fh.write(data)
+
+        if self._bytes_written >= DEAD_LETTER_FILE_MAX_BYTES:
+            fh.close()
+            self._fh = None
+
     def write_dead_letter_event(self, event: Dict[str, Any]) -> bool:
         """
-        Write a dead letter event to a JSON file.
-        
+        Append a dead letter event to the current NDJSON file.
+
         Args:
             event: Dead letter event to write
-            
+
         Returns:
             bool: True if written successfully
         """
+        if self.is_null:
+            return True
+
         try:
-            # Create filename with timestamp and UUID
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            file_uuid = str(uuid.uuid4())[:8]
-            filename = f"dead_letter_{timestamp}_{file_uuid}.json"
-            filepath = os.path.join(self.output_dir, filename)
-            
-            # Write event to JSON file
-            import json
-            with open(filepath, 'w') as f:
-                json.dump(event, f, indent=2, default=str)
-            
+            # Serialize with orjson straight to bytes; default=str keeps
+            # parity with plain json for non-JSON types
+            self._append(orjson.dumps(event, default=str) + b"\n")
+
             self.event_count += 1
-            logger.warning(f"Wrote dead letter event to {filename}")
-            
+
             return True
-            
+
         except Exception as e:
-            logger.error(f"Failed to write dead letter event: {e}")
+            logger.error("Failed to write dead letter event: %s", e)
             return False
-    
+
+    def write_dead_letter_events_batch(self, events: List[Dict[str, Any]]) -> bool:
+        """
+        Append a batch of dead letter events in one buffered write.
+
+        Amortizes serialization framing and the write call across the
+        whole batch instead of paying them once per event.
+
+        Args:
+            events: Dead letter events to write
+
+        Returns:
+            bool: True if written successfully
+        """
+        if not events or self.is_null:
+            return True
+
+        try:
+            lines = b"".join(
+                orjson.dumps(event, default=str) + b"\n" for event in events
+            )
+            self._append(lines)
+
+            self.event_count += len(events)
+
+            return True
+
+        except Exception as e:
+            logger.error("Failed to write dead letter batch: %s", e)
+            return False
+
     def get_stats(self) -> Dict[str, Any]:
         """
         Get statistics about the dead letter sink writer.
-        
+
         Returns:
             Dict containing statistics
         """
@@ -302,6 +536,16 @@ class DeadLetterSinkWriter:
             "output_directory": self.output_dir
         }
 
+    def close(self):
+        """Flush and close the current dead letter file, if any."""
+        if self._fh is not None:
+            self._fh.flush()
+            os.fsync(self._fh.fileno())
+            self._fh.close()
+            self._fh = None
+
+        logger.info(f"Dead letter sink writer closed. Events written: {self.event_count}")
+
 
 # Convenience functions
 def write_events_to_parquet(events: List[Dict[str, Any]], output_dir: str = None) -> bool:
@@ -318,7 +562,7 @@ def write_events_to_parquet(events: List[Dict[str, Any]], output_dir: str = None
     writer = ParquetSinkWriter(output_dir=output_dir)
     
     try:
-        writer.add_events(events)
+        writer.add_events_bulk(events)
         return writer.close()
     except Exception as e:
         logger.error(f"Failed to write events to Parquet: {e}")
@@ -2,13 +2,35 @@
 Event transformation module with simple transformations for the streaming pipeline.
 """
 import logging
-from typing import Dict, Any, Optional
-from datetime import datetime
+from typing import Any
+import pyarrow as pa
+import pyarrow.compute as pc
 
-from src.utils import setup_logging
+from src.utils import setup_logging, now_iso
 
 logger = setup_logging(__name__)
 
+# Event-type -> category lookup table; a single dict.get replaces the
+# per-event chain of list membership scans
+_CATEGORY = {
+    "purchase": "conversion",
+    "signup": "conversion",
+    "page_view": "engagement",
+    "click": "engagement",
+    "login": "authentication",
+    "logout": "authentication",
+}
+
+# Memoized uppercase forms of the known event types: a dict hit returns
+# the shared interned string instead of allocating a fresh copy with
+# str.upper() on every event
+_NORMALIZED = {event_type: event_type.upper() for event_type in _CATEGORY}
+
+# Batches at or above this size go through the columnar transform even
+# on the dict-in/dict-out path; below it the Arrow round trip costs
+# more than the per-event loop saves
+COLUMNAR_BATCH_THRESHOLD = 1000
+
 
 class EventTransformer:
     """
@@ -24,59 +46,45 @@ class EventTransformer:
         """Initialize the event transformer."""
         logger.info("Event transformer initialized")
     
-    def transform_user_event(self, event: Dict[str, Any]) -> Dict[str, Any]:
+    def transform_user_event(self, event: dict[str, Any]) -> dict[str, Any]:
         """
         Transform a user event into a processed event.
-        
+
+        The event dict is transformed in place and returned; no caller
+        reuses the raw dict afterwards, so copying it per event would
+        only churn memory.
+
         Args:
-            event: Raw user event data
-            
+            event: Raw user event data, mutated in place
+
         Returns:
-            Transformed event data
+            The same dict with the transformed fields added
+
+        Raises:
+            Exception: Propagated from malformed events; batch callers
+                catch at their boundary rather than paying a second
+                try frame here per event
         """
-        try:
-            # Start with original event
-            transformed = event.copy()
-            
-            # Apply simple transformations
-            transformed.update(self._normalize_event_type(event))
-            transformed.update(self._add_processing_metadata())
-            
-            logger.debug(f"Transformed event: {event.get('event_type', 'unknown')}")
-            return transformed
-            
-        except Exception as e:
-            logger.error(f"Failed to transform event: {e}")
-            raise
-    
-    def _normalize_event_type(self, event: Dict[str, Any]) -> Dict[str, Any]:
-        """Normalize event type to uppercase."""
         event_type = event.get("event_type", "unknown")
-        
-        return {
-            "normalized_event_type": event_type.upper(),
-            "event_category": self._get_event_category(event_type)
-        }
-    
+        event_category = _CATEGORY.get(event_type, "other")
+
+        event["normalized_event_type"] = (
+            _NORMALIZED.get(event_type) or event_type.upper()
+        )
+        event["event_category"] = event_category
+        event["is_conversion"] = event_category == "conversion"
+        event["processed_at"] = now_iso()
+        event["processing_version"] = "1.0"
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Transformed event: %s", event_type)
+        return event
+
     def _get_event_category(self, event_type: str) -> str:
         """Simple event categorization."""
-        if event_type in ["purchase", "signup"]:
-            return "conversion"
-        elif event_type in ["page_view", "click"]:
-            return "engagement"
-        elif event_type in ["login", "logout"]:
-            return "authentication"
-        else:
-            return "other"
-    
-    def _add_processing_metadata(self) -> Dict[str, Any]:
-        """Add processing metadata to transformed event."""
-        return {
-            "processed_at": datetime.now().isoformat(),
-            "processing_version": "1.0"
-        }
-    
-    def transform_batch(self, events: list[Dict[str, Any]]) -> list[Dict[str, Any]]:
+        return _CATEGORY.get(event_type, "other")
+
+    def transform_batch(self, events: list[dict[str, Any]]) -> list[dict[str, Any]]:
         """
         Transform a batch of events.
         
@@ -86,8 +94,19 @@ class EventTransformer:
         Returns:
             List of transformed events
         """
+        if len(events) >= COLUMNAR_BATCH_THRESHOLD:
+            # Large batches: one columnar pass over the event-type
+            # column beats dispatching Python per event, even counting
+            # the conversion back to dicts
+            try:
+                transformed_events = self.transform_batch_columnar(events).to_pylist()
+                logger.info(f"Transformed {len(transformed_events)} out of {len(events)} events")
+                return transformed_events
+            except Exception as e:
+                logger.error(f"Columnar batch transform failed, falling back to per-event: {e}")
+
         transformed_events = []
-        
+
         for event in events:
             try:
                 transformed = self.transform_user_event(event)
@@ -100,27 +119,72 @@ class EventTransformer:
         logger.info(f"Transformed {len(transformed_events)} out of {len(events)} events")
         return transformed_events
 
+    def transform_batch_columnar(self, events: list[dict[str, Any]]) -> pa.Table:
+        """
+        Transform a batch of events in column-oriented form.
+
+        Instead of building one output dict per event, this converts the
+        batch to an Arrow table once and derives the new columns with
+        pyarrow.compute kernels, replacing per-event Python dispatch with
+        a handful of C calls per column.
+
+        Args:
+            events: List of raw events
+
+        Returns:
+            Arrow table with the transformed columns appended
+        """
+        table = pa.Table.from_pylist(events)
+
+        if 'event_type' in table.column_names:
+            event_types = pc.fill_null(table.column('event_type'), 'unknown').combine_chunks()
+        else:
+            event_types = pa.array(['unknown'] * table.num_rows)
+
+        # Normalize event types in one kernel call
+        normalized = pc.utf8_upper(event_types)
+
+        # Derive per-type columns from the unique values only, then fan
+        # back out over the batch through the dictionary codes
+        encoded = event_types.dictionary_encode()
+        unique_categories = [
+            self._get_event_category(value) for value in encoded.dictionary.to_pylist()
+        ]
+        categories = pa.array(unique_categories).take(encoded.indices)
+        is_conversion = pa.array(
+            [category == "conversion" for category in unique_categories]
+        ).take(encoded.indices)
+
+        # Processing metadata is constant across the batch
+        processed_at = pa.array([now_iso()] * table.num_rows)
+        processing_version = pa.array(["1.0"] * table.num_rows)
+
+        table = table.append_column('normalized_event_type', normalized)
+        table = table.append_column('event_category', categories)
+        table = table.append_column('is_conversion', is_conversion)
+        table = table.append_column('processed_at', processed_at)
+        table = table.append_column('processing_version', processing_version)
+
+        logger.debug("Columnar-transformed batch of %d events", table.num_rows)
+        return table
+
 
 # Simple convenience functions
 def normalize_event_type(event_type: str) -> str:
     """Normalize event type to uppercase."""
+    cached = _NORMALIZED.get(event_type)
+    if cached is not None:
+        return cached
     return event_type.upper() if event_type else "UNKNOWN"
 
 
 def get_event_category(event_type: str) -> str:
     """Get event category."""
-    if event_type in ["purchase", "signup"]:
-        return "conversion"
-    elif event_type in ["page_view", "click"]:
-        return "engagement"
-    elif event_type in ["login", "logout"]:
-        return "authentication"
-    else:
-        return "other"
+    return _CATEGORY.get(event_type, "other")
 
 
-def add_processing_metadata(event: Dict[str, Any]) -> Dict[str, Any]:
+def add_processing_metadata(event: dict[str, Any]) -> dict[str, Any]:
     """Add processing metadata to event."""
-    event["processed_at"] = datetime.now().isoformat()
+    event["processed_at"] = now_iso()
     event["processing_version"] = "1.0"
     return event 
\ No newline at end of file
@@ -2,8 +2,10 @@
 Utility functions for Kafka operations and common tasks.
 """
 import logging
+import time
 from typing import Dict, Any, Optional
 from datetime import datetime
+import orjson
 from confluent_kafka import KafkaException
 from confluent_kafka.admin import AdminClient, NewTopic
 from confluent_kafka import Producer, Consumer
@@ -24,6 +26,25 @@ def setup_logging(name: str) -> logging.Logger:
     return logging.getLogger(name)
 
 
+# Formatted-timestamp cache keyed on the current millisecond; callers
+# stamping many events within the same millisecond reuse one ISO string
+# instead of re-running datetime formatting per event
+_now_iso_cache_ms = -1
+_now_iso_cache_value = ''
+
+
+def now_iso() -> str:
+    """Get the current ISO timestamp, cached at millisecond resolution."""
+    global _now_iso_cache_ms, _now_iso_cache_value
+
+    now_ms = time.time_ns() // 1_000_000
+    if now_ms != _now_iso_cache_ms:
+        _now_iso_cache_ms = now_ms
+        _now_iso_cache_value = datetime.now().isoformat()
+
+    return _now_iso_cache_value
+
+
 def create_kafka_topics() -> bool:
     """
     Create Kafka topics if they don't exist.
@@ -109,22 +130,16 @@ def get_consumer() -> Consumer:
 def safe_json_serialize(obj: Any) -> str:
     """
     Safely serialize object to JSON string.
-    
+
     Args:
         obj: Object to serialize
-        
+
     Returns:
         str: JSON string representation
     """
-    import json
-    
-    class DateTimeEncoder(json.JSONEncoder):
-        def default(self, obj):
-            if isinstance(obj, datetime):
-                return obj.isoformat()
-            return super().default(obj)
-    
-    return json.dumps(obj, cls=DateTimeEncoder)
+    # orjson serializes datetime natively in C, so the per-call encoder
+    # class and json import this used to define are gone
+    return orjson.dumps(obj).decode()
 
 
 def format_error_message(error: Exception, context: Dict[str, Any] = None) -> Dict[str, Any]:
@@ -141,7 +156,7 @@ def format_error_message(error: Exception, context: Dict[str, Any] = None) -> Di
     error_info = {
         'error_type': type(error).__name__,
         'error_message': str(error),
-        'timestamp': datetime.now().isoformat()
+        'timestamp': now_iso()
     }
     
     if context:
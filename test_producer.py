@@ -2,8 +2,7 @@
 """
 Simple test producer to generate messages visible in Control Center UI.
 """
-import json
-import time
+import orjson
 from confluent_kafka import Producer
 from faker import Faker
 
@@ -51,30 +50,30 @@ def main():
     for i in range(10):
         # Generate valid event
         event = generate_event()
-        event_json = json.dumps(event)
-        
-        # Produce to events topic
+
+        # Produce to events topic; orjson serializes straight to bytes
         producer.produce(
             topic='events-topic',
-            value=event_json.encode('utf-8'),
+            value=orjson.dumps(event),
             callback=delivery_report
         )
         
         # Generate invalid event for dead letter
         invalid_event = event.copy()
         invalid_event['event_type'] = 'invalid_event_type'
-        invalid_event_json = json.dumps(invalid_event)
-        
+
         # Produce to dead letter topic
         producer.produce(
             topic='dead-letter-topic',
-            value=invalid_event_json.encode('utf-8'),
+            value=orjson.dumps(invalid_event),
             callback=delivery_report
         )
         
         print(f"Produced message {i+1}")
-        time.sleep(1)
-    
+        # Serve delivery callbacks without blocking; the single flush
+        # below drains everything
+        producer.poll(0)
+
     # Flush to ensure delivery
     producer.flush()
     print("Done producing messages!")
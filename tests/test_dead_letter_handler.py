@@ -2,23 +2,19 @@
 Tests for the dead letter handler.
 """
 import pytest
-import tempfile
-import shutil
-from src.dead_letter_handler import DeadLetterHandler, process_dead_letter_event
+from src.dead_letter_handler import DeadLetterHandler, process_dead_letter_event, analyze_dead_letter_events
 
 
 class TestDeadLetterHandler:
     """Test DeadLetterHandler functionality."""
-    
-    def setup_method(self):
+
+    @pytest.fixture(autouse=True)
+    def _setup(self, tmp_path):
         """Set up test environment."""
-        self.temp_dir = tempfile.mkdtemp()
-        self.handler = DeadLetterHandler()
-    
-    def teardown_method(self):
-        """Clean up test environment."""
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-    
+        self.handler = DeadLetterHandler(output_dir=str(tmp_path))
+        yield
+        self.handler.close()
+
     def test_process_dead_letter_event(self):
         """Test processing a dead letter event."""
         event = {
@@ -112,6 +108,42 @@ class TestDeadLetterHandler:
         assert analysis['error_category'] == 'missing_required_field'
         assert analysis['can_retry'] is False
     
+    def test_validator_message_categorization(self):
+        """Test categorization of messages the schema validator actually raises."""
+        from jsonschema import ValidationError
+        from schema.schema_validator import SchemaValidator
+
+        validator = SchemaValidator()
+        base = {
+            "user_id": "user-123",
+            "event_type": "page_view",
+            "timestamp": "2023-01-01T12:00:00",
+            "session_id": "sess-1"
+        }
+
+        def validator_message(event_data):
+            with pytest.raises(ValidationError) as exc_info:
+                validator.validate_user_event(event_data)
+            return exc_info.value.message
+
+        cases = [
+            (dict(base, event_type="bogus"), 'invalid_enum_value'),
+            ({k: v for k, v in base.items() if k != 'user_id'},
+             'missing_required_field'),
+        ]
+
+        for event_data, expected_category in cases:
+            event = {
+                "original_event": event_data,
+                "error_type": "ValidationError",
+                "error_message": validator_message(event_data),
+                "failed_at": "2023-01-01T12:00:00",
+                "processing_stage": "producer_validation"
+            }
+
+            assert self.handler.process_dead_letter_event(event) is True
+            assert event['error_analysis']['error_category'] == expected_category
+
     def test_remediation_suggestions(self):
         """Test remediation suggestion logic."""
         event = {
@@ -170,6 +202,83 @@ class TestDeadLetterHandler:
         self.handler.close()  # Should not raise any exceptions
 
 
+class TestDeadLetterBatchAnalysis:
+    """Test batch analysis of dead letter events."""
+
+    @pytest.fixture(autouse=True)
+    def _setup(self, tmp_path):
+        """Set up test environment."""
+        self.handler = DeadLetterHandler(output_dir=str(tmp_path))
+        yield
+        self.handler.close()
+
+    def test_analyze_batch(self):
+        """Test analyzing a batch of dead letter events."""
+        events = [
+            {
+                "original_event": {"user_id": "user-1"},
+                "error_type": "ValidationError",
+                "error_message": "Missing required field: event_type",
+                "failed_at": "2023-01-01T12:00:00",
+                "processing_stage": "producer_validation"
+            },
+            {
+                "original_event": {"user_id": "user-2"},
+                "error_type": "ConnectionError",
+                "error_message": "Connection timeout",
+                "failed_at": "2023-01-01T12:00:00",
+                "processing_stage": "consumer_validation"
+            },
+            {
+                "original_event": {"user_id": "user-3"},
+                "error_type": "ConnectionError",
+                "error_message": "Connection timeout",
+                "failed_at": "2023-01-01T12:00:00",
+                "processing_stage": "consumer_validation"
+            }
+        ]
+
+        analysis = self.handler.analyze_batch(events)
+
+        assert analysis['total_events'] == 3
+        assert analysis['error_categories']['missing_required_field'] == 1
+        assert analysis['error_categories']['network_error'] == 2
+        assert analysis['processing_stages']['consumer_validation'] == 2
+        assert analysis['retryable_events'] == 2
+        assert 'Events with missing required fields' in analysis['patterns']
+        assert 'Network connectivity issues' in analysis['patterns']
+
+    def test_process_batch(self):
+        """Test batch processing with a single sink write."""
+        events = [
+            {
+                "original_event": {"user_id": f"user-{i}"},
+                "error_type": "ValidationError",
+                "error_message": "Invalid event type",
+                "failed_at": "2023-01-01T12:00:00",
+                "processing_stage": "producer_validation"
+            }
+            for i in range(3)
+        ]
+
+        processed = self.handler.process_batch(events)
+
+        assert processed == 3
+        assert all('error_analysis' in event for event in events)
+
+        stats = self.handler.get_error_statistics()
+        assert stats['processed_dead_letter_events'] == 3
+
+    def test_analyze_empty_batch(self):
+        """Test analyzing an empty batch."""
+        analysis = self.handler.analyze_batch([])
+
+        assert analysis['total_events'] == 0
+        assert analysis['error_categories'] == {}
+        assert analysis['retryable_events'] == 0
+        assert analysis['patterns'] == []
+
+
 def test_process_dead_letter_event_function():
     """Test the convenience function."""
     event = {
@@ -182,4 +291,21 @@ def test_process_dead_letter_event_function():
     
     success = process_dead_letter_event(event)
     assert success is True
-    assert 'error_analysis' in event 
\ No newline at end of file
+    assert 'error_analysis' in event
+
+
+def test_analyze_dead_letter_events_function():
+    """Test the batch analysis convenience function."""
+    events = [
+        {
+            "original_event": {"user_id": "user-1"},
+            "error_type": "ConnectionError",
+            "error_message": "Connection timeout",
+            "failed_at": "2023-01-01T12:00:00",
+            "processing_stage": "consumer_validation"
+        }
+    ]
+
+    analysis = analyze_dead_letter_events(events)
+
+    assert analysis['error_categories'] == {'network_error': 1} 
\ No newline at end of file
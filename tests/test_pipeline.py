@@ -2,8 +2,6 @@
 Tests for the end-to-end streaming pipeline.
 """
 import pytest
-import tempfile
-import shutil
 import time
 from unittest.mock import Mock, patch, MagicMock
 from src.pipeline import StreamingPipeline, PipelineHealthChecker, PipelineMetrics
@@ -88,33 +86,55 @@ class TestPipelineMetrics:
         assert metrics.get_error_rate() == 100.0
 
 
+# Prebuilt healthy component mocks shared across the health checker
+# tests; building four Mocks per test adds up, so each test only
+# mutates the field it is exercising (and restores healthy values
+# where a later test depends on them)
+@pytest.fixture(scope='module')
+def healthy_mocks():
+    producer = Mock(event_count=100, error_count=5)
+    consumer = Mock(processed_count=100, error_count=5, batch_count=10)
+    sink_writer = Mock()
+    sink_writer.get_stats.return_value = {
+        'total_events_written': 100,
+        'files_written': 5,
+        'write_failures': 0
+    }
+    handler = Mock()
+    handler.get_error_statistics.return_value = {
+        'processed_dead_letter_events': 10,
+        'failed_dead_letter_events': 0,
+        'success_rate': 1.0
+    }
+    return producer, consumer, sink_writer, handler
+
+
 class TestPipelineHealthChecker:
     """Test PipelineHealthChecker functionality."""
-    
+
     def setup_method(self):
         """Set up test environment."""
         self.health_checker = PipelineHealthChecker()
-    
-    def test_producer_health_check_healthy(self):
+
+    def test_producer_health_check_healthy(self, healthy_mocks):
         """Test producer health check when healthy."""
-        producer = Mock()
+        producer, _, _, _ = healthy_mocks
         producer.event_count = 100
         producer.error_count = 5
-        
+
         health = self.health_checker.check_producer_health(producer)
-        
+
         assert health['status'] == 'healthy'
         assert health['events_produced'] == 100
         assert health['errors'] == 5
-    
-    def test_producer_health_check_warning(self):
+
+    def test_producer_health_check_warning(self, healthy_mocks):
         """Test producer health check when error rate is high."""
-        producer = Mock()
-        producer.event_count = 100
+        producer, _, _, _ = healthy_mocks
         producer.error_count = 15  # 15% error rate
-        
+
         health = self.health_checker.check_producer_health(producer)
-        
+
         assert health['status'] == 'warning'
         assert 'High error rate detected' in health['message']
     
@@ -132,13 +152,10 @@ class TestPipelineHealthChecker:
         assert health['status'] == 'unhealthy'
         assert 'error' in health
     
-    def test_consumer_health_check_healthy(self):
+    def test_consumer_health_check_healthy(self, healthy_mocks):
         """Test consumer health check when healthy."""
-        consumer = Mock()
-        consumer.processed_count = 100
-        consumer.error_count = 5
-        consumer.batch_count = 10
-        
+        _, consumer, _, _ = healthy_mocks
+
         health = self.health_checker.check_consumer_health(consumer)
         
         assert health['status'] == 'healthy'
@@ -146,73 +163,50 @@ class TestPipelineHealthChecker:
         assert health['errors'] == 5
         assert health['batches_processed'] == 10
     
-    def test_sink_health_check_healthy(self):
+    def test_sink_health_check_healthy(self, healthy_mocks):
         """Test sink health check when healthy."""
-        sink_writer = Mock()
-        sink_writer.get_stats.return_value = {
-            'total_events_written': 100,
-            'files_written': 5,
-            'write_failures': 0
-        }
-        
+        _, _, sink_writer, _ = healthy_mocks
+
         health = self.health_checker.check_sink_health(sink_writer)
-        
+
         assert health['status'] == 'healthy'
         assert health['total_events_written'] == 100
-    
-    def test_sink_health_check_warning(self):
+
+    def test_sink_health_check_warning(self, healthy_mocks):
         """Test sink health check when there are write failures."""
-        sink_writer = Mock()
+        _, _, sink_writer, _ = healthy_mocks
         sink_writer.get_stats.return_value = {
             'total_events_written': 100,
             'files_written': 5,
             'write_failures': 3
         }
-        
+
         health = self.health_checker.check_sink_health(sink_writer)
-        
+
         assert health['status'] == 'warning'
         assert 'Write failures detected' in health['message']
-    
-    def test_dead_letter_health_check_healthy(self):
+
+    def test_dead_letter_health_check_healthy(self, healthy_mocks):
         """Test dead letter handler health check when healthy."""
-        handler = Mock()
-        handler.get_error_statistics.return_value = {
-            'processed_dead_letter_events': 10,
-            'failed_dead_letter_events': 0,
-            'success_rate': 1.0
-        }
-        
+        _, _, _, handler = healthy_mocks
+
         health = self.health_checker.check_dead_letter_health(handler)
-        
+
         assert health['status'] == 'healthy'
         assert health['processed_dead_letter_events'] == 10
-    
-    def test_overall_health_check(self):
+
+    def test_overall_health_check(self, healthy_mocks):
         """Test overall health check."""
-        producer = Mock()
-        producer.event_count = 100
+        producer, consumer, sink_writer, handler = healthy_mocks
+
+        # Restore healthy values touched by the warning tests above
         producer.error_count = 5
-        
-        consumer = Mock()
-        consumer.processed_count = 100
-        consumer.error_count = 5
-        consumer.batch_count = 10
-        
-        sink_writer = Mock()
         sink_writer.get_stats.return_value = {
             'total_events_written': 100,
             'files_written': 5,
             'write_failures': 0
         }
-        
-        handler = Mock()
-        handler.get_error_statistics.return_value = {
-            'processed_dead_letter_events': 10,
-            'failed_dead_letter_events': 0,
-            'success_rate': 1.0
-        }
-        
+
         components = {
             'producer': producer,
             'consumer': consumer,
@@ -265,25 +259,32 @@ def patch_kafka():
     with patch('src.consumer.Consumer', new=DummyConsumer), patch('src.producer.Producer', new=Mock):
         yield
 
+
+# One temp root per test session; per-test directories are cheap mkdirs
+# under it instead of a full mkdtemp/rmtree cycle for every test
+@pytest.fixture(scope='session')
+def _temp_root(tmp_path_factory):
+    return tmp_path_factory.mktemp('pipeline')
+
+
+@pytest.fixture
+def temp_dir(_temp_root, request):
+    path = _temp_root / request.node.name
+    path.mkdir()
+    return str(path)
+
+
 class TestStreamingPipeline:
     """Test StreamingPipeline functionality."""
-    
-    def setup_method(self):
+
+    @pytest.fixture(autouse=True)
+    def _setup(self, temp_dir):
         """Set up test environment."""
-        self.temp_dir = tempfile.mkdtemp()
-        
-        # Mock Kafka components
-        mock_producer = Mock()
-        mock_consumer = Mock()
-        
+        self.temp_dir = temp_dir
         self.pipeline = StreamingPipeline()
-    
-    def teardown_method(self):
-        """Clean up test environment."""
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-        if hasattr(self, 'pipeline'):
-            self.pipeline.stop()
-    
+        yield
+        self.pipeline.stop()
+
     def test_pipeline_initialization(self):
         """Test pipeline initialization."""
         assert self.pipeline.is_running is False
@@ -396,15 +397,12 @@ class TestStreamingPipeline:
 
 class TestPipelineIntegration:
     """Integration tests for the streaming pipeline."""
-    
-    def setup_method(self):
+
+    @pytest.fixture(autouse=True)
+    def _setup(self, temp_dir):
         """Set up test environment."""
-        self.temp_dir = tempfile.mkdtemp()
-    
-    def teardown_method(self):
-        """Clean up test environment."""
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-    
+        self.temp_dir = temp_dir
+
     @patch('src.consumer.Consumer')
     @patch('src.producer.Producer')
     def test_pipeline_components_integration(self, mock_producer, mock_consumer):
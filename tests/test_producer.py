@@ -73,9 +73,10 @@ class TestEventProducer:
         success = producer.publish_event(event, "test-topic")
         assert success is True
         
-        # Check that produce was called
+        # Check that produce was called; poll is served periodically
+        # rather than once per publish
         mock_producer.produce.assert_called_once()
-        mock_producer.poll.assert_called_once()
+        mock_producer.poll.assert_not_called()
     
     @patch('src.producer.Producer')
     def test_publish_event_failure(self, mock_producer_class):
@@ -98,6 +98,17 @@ class TestSchemaValidatorMappings:
         assert validator.is_conversion_event("page_view") is False
         assert validator.is_conversion_event("click") is False
 
+    def test_classify_series(self):
+        """Test vectorized classification of an event type column."""
+        import pandas as pd
+        validator = SchemaValidator()
+
+        event_types = pd.Series(["purchase", "page_view", "unknown"])
+        categories, is_conversion = validator.classify_series(event_types)
+
+        assert list(categories) == ["commerce", "navigation", "other"]
+        assert list(is_conversion) == [True, False, False]
+
 
 class TestSchemaValidatorErrors:
     """Test schema validation error handling."""
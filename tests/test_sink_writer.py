@@ -2,6 +2,7 @@
 Tests for the Parquet sink writer.
 """
 import pytest
+import json
 import os
 import tempfile
 import shutil
@@ -209,16 +210,17 @@ class TestDeadLetterSinkWriter:
             "failed_at": "2023-01-01T12:00:00",
             "processing_stage": "producer_validation"
         }
-        
+
         success = self.writer.write_dead_letter_event(event)
         assert success is True
-        
+        self.writer.close()
+
         # Check that file was created
         files = os.listdir(self.temp_dir)
         assert len(files) == 1
-        assert files[0].endswith('.json')
+        assert files[0].endswith('.ndjson')
         assert files[0].startswith('dead_letter_')
-    
+
     def test_write_multiple_dead_letter_events(self):
         """Test writing multiple dead letter events."""
         events = [
@@ -237,16 +239,23 @@ class TestDeadLetterSinkWriter:
                 "processing_stage": "consumer_validation"
             }
         ]
-        
+
         for event in events:
             success = self.writer.write_dead_letter_event(event)
             assert success is True
-        
-        # Check that files were created
+        self.writer.close()
+
+        # Events append to one NDJSON file, one JSON document per line
         files = os.listdir(self.temp_dir)
-        assert len(files) == 2
-        assert all(f.endswith('.json') for f in files)
-        assert all(f.startswith('dead_letter_') for f in files)
+        assert len(files) == 1
+        assert files[0].endswith('.ndjson')
+        assert files[0].startswith('dead_letter_')
+
+        with open(os.path.join(self.temp_dir, files[0])) as f:
+            lines = f.read().splitlines()
+        assert len(lines) == 2
+        assert json.loads(lines[0])['error_message'] == "Invalid event type"
+        assert json.loads(lines[1])['error_message'] == "Negative amount"
     
     def test_get_stats(self):
         """Test getting statistics."""